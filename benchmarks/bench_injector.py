@@ -0,0 +1,299 @@
+"""
+Time the injector's hot paths against plain wired.
+
+Each case injects a target and, as the baseline, builds the same
+thing by hand with ``container.get``. The difference is what the
+injector costs::
+
+    $ python benchmarks/bench_injector.py
+    $ python benchmarks/bench_injector.py -k pipeline --interpreted
+
+"Warm" cases reuse one container, as within a request. "Request"
+cases make a new container each time, so nested injectables are
+built rather than served from the container's cache.
+"""
+import argparse
+import os
+import sys
+import timeit
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from wired import ServiceContainer, ServiceRegistry
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.operators import Attr, Context, Get
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+# Settings as the tests use it, from the root of the repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from examples.factories import Settings  # noqa: E402
+
+
+class Customer:
+    name = 'Customer'
+
+
+class FrenchCustomer(Customer):
+    name = 'French Customer'
+
+
+@dataclass
+class View:
+    name: str = 'View'
+
+
+@dataclass
+class FrenchView(View):
+    name: str = 'French View'
+
+
+def make_registry() -> InjectorRegistry:
+    registry = InjectorRegistry()
+    registry.register_singleton(Settings(), Settings)
+    registry.register_factory(lambda c: View(), View)
+    registry.register_factory(
+        lambda c: FrenchView(), View, context=FrenchCustomer
+    )
+    return registry
+
+
+# Targets
+
+
+@dataclass
+class DataclassTarget:
+    settings: Settings
+    view: View
+    title: str = 'Title'
+
+
+def function_target(settings: Settings, view: View, title: str = 'Title'):
+    return settings, view, title
+
+
+class NamedTupleTarget(NamedTuple):
+    settings: Settings
+    view: View
+    title: str = 'Title'
+
+
+@dataclass
+class PipelineTarget:
+    view_name: Annotated[str, Get(View), Attr('name')]
+    site_name: Annotated[str, Get(Settings, attr='site_name')]
+    customer: Annotated[Customer, Context()]
+
+
+@dataclass
+class PropsTarget:
+    title: str
+    settings: Settings
+    site: str = 'Default'
+
+
+@dataclass
+class Inner:
+    settings: Settings
+    view: View
+
+
+@dataclass
+class Outer:
+    inner: Inner
+    view: View
+
+
+def make_chain(depth: int) -> List[type]:
+    """ Classes where each depends on the one before """
+
+    levels: List[type] = []
+    for i in range(depth):
+        annotations: Dict[str, Any] = {'settings': Settings}
+        if levels:
+            annotations['previous'] = levels[-1]
+        level = type(f'Level{i}', (), {'__annotations__': annotations})
+        levels.append(dataclass(level))
+    return levels
+
+
+class Case(NamedTuple):
+    name: str
+    injected: Callable[[], Any]
+    baseline: Callable[[], Any]
+
+
+def warm_cases(compiled: bool) -> List[Case]:
+    """ Inject on an existing container """
+
+    def container_for(context=None) -> Tuple[ServiceContainer, Injector]:
+        container = make_registry().create_injectable_container(
+            context=context
+        )
+        injector = container.get(Injector)
+        injector.compiled = compiled
+        return container, injector
+
+    c, injector = container_for()
+    cases = [
+        Case(
+            'dataclass',
+            lambda: injector(DataclassTarget),
+            lambda: DataclassTarget(c.get(Settings), c.get(View)),
+        ),
+        Case(
+            'function',
+            lambda: injector(function_target),
+            lambda: function_target(c.get(Settings), c.get(View)),
+        ),
+        Case(
+            'namedtuple',
+            lambda: injector(NamedTupleTarget),
+            lambda: NamedTupleTarget(c.get(Settings), c.get(View)),
+        ),
+        Case(
+            'props',
+            lambda: injector(PropsTarget, title='Hello'),
+            lambda: PropsTarget('Hello', c.get(Settings)),
+        ),
+        Case(
+            'system_props',
+            lambda: injector(
+                PropsTarget, system_props=dict(site='Site'), title='Hello'
+            ),
+            lambda: PropsTarget('Hello', c.get(Settings), 'Site'),
+        ),
+    ]
+
+    customer = Customer()
+    c2, injector2 = container_for(customer)
+    cases.append(
+        Case(
+            'pipeline Get/Attr/Context',
+            lambda: injector2(PipelineTarget),
+            lambda: PipelineTarget(
+                c2.get(View).name, c2.get(Settings).site_name, c2.context
+            ),
+        )
+    )
+
+    c3, injector3 = container_for(FrenchCustomer())
+    cases.append(
+        Case(
+            'context override',
+            lambda: injector3(DataclassTarget),
+            lambda: DataclassTarget(c3.get(Settings), c3.get(View)),
+        )
+    )
+    return cases
+
+
+def request_cases(compiled: bool, depth: int) -> List[Case]:
+    """ A new container each time, injectables are built every time """
+
+    def injector_registry(targets: List[type]) -> InjectorRegistry:
+        registry = make_registry()
+        for target in targets:
+            registry.register_injectable(target, target)
+        return registry
+
+    def wired_registry(factories: Dict[type, Callable]) -> ServiceRegistry:
+        registry = ServiceRegistry()
+        registry.register_singleton(Settings(), Settings)
+        registry.register_factory(lambda c: View(), View)
+        for target, factory in factories.items():
+            registry.register_factory(factory, target)
+        return registry
+
+    def get(registry: InjectorRegistry, target: type) -> Callable[[], Any]:
+        def inject():
+            container = registry.create_injectable_container()
+            container.get(Injector).compiled = compiled
+            return container.get(target)
+
+        return inject
+
+    nested = injector_registry([Inner, Outer])
+    nested_wired = wired_registry(
+        {
+            Inner: lambda c: Inner(c.get(Settings), c.get(View)),
+            Outer: lambda c: Outer(c.get(Inner), c.get(View)),
+        }
+    )
+
+    levels = make_chain(depth)
+    chain = injector_registry(levels)
+    first = levels[0]
+    chain_factories: Dict[type, Callable] = {
+        first: lambda c: first(c.get(Settings))
+    }
+    for previous, level in zip(levels, levels[1:]):
+        chain_factories[level] = _next_level(level, previous)
+    chain_wired = wired_registry(chain_factories)
+
+    return [
+        Case(
+            'nested injectables',
+            get(nested, Outer),
+            lambda: nested_wired.create_container().get(Outer),
+        ),
+        Case(
+            f'chain of {depth}',
+            get(chain, levels[-1]),
+            lambda: chain_wired.create_container().get(levels[-1]),
+        ),
+    ]
+
+
+def _next_level(level: type, previous: type) -> Callable:
+    def factory(container: ServiceContainer) -> Any:
+        return level(container.get(Settings), container.get(previous))
+
+    return factory
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """ Best time per call, in microseconds """
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-k', dest='keyword', help='only matching cases')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--depth', type=int, default=10)
+    parser.add_argument(
+        '--interpreted',
+        action='store_true',
+        help='use the rules loop, not compiled injectors',
+    )
+    args = parser.parse_args(argv)
+
+    compiled = not args.interpreted
+    cases = warm_cases(compiled) + request_cases(compiled, args.depth)
+    if args.keyword:
+        cases = [case for case in cases if args.keyword in case.name]
+
+    print(
+        f'{"case":<28} {"injector us":>12} {"wired us":>10} '
+        f'{"overhead us":>12} {"ratio":>7}'
+    )
+    for case in cases:
+        # Same result both ways, and warms up the plan caches
+        assert type(case.injected()) is type(case.baseline()), case.name
+        injected = measure(case.injected, args.repeat)
+        baseline = measure(case.baseline, args.repeat)
+        print(
+            f'{case.name:<28} {injected:>12.2f} {baseline:>10.2f} '
+            f'{injected - baseline:>12.2f} {injected / baseline:>6.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,12 @@ except ImportError:
     from typing_extensions import Annotated  # type: ignore
 
 
+# Site-wide settings, registered as a singleton where needed
+class Settings:
+    site_name = 'My Site'
+    language = 'en'
+
+
 # Normal kind of customer
 @dataclass
 class Customer:
@@ -0,0 +1,257 @@
+"""
+Inject when factories, operators or the target itself are async.
+
+``AsyncInjector.ainject`` works like calling an ``Injector`` but
+awaits what needs awaiting: a service whose factory is a coroutine
+function, an operator returning an awaitable, or an async target.
+Fields which need to wait are resolved concurrently, so a target
+with three I/O-bound dependencies waits for the slowest, not the sum.
+
+wired caches each service per container, which for an async factory
+means caching the coroutine. The first lookup turns it into a task
+and later lookups, even from other fields, await that same task.
+"""
+import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from inspect import isawaitable, isclass
+from typing import Any, Awaitable, Dict, Mapping, Optional, Tuple
+
+from wired_injector.injector import CycleError, Injector
+from wired_injector.operators import Get, Operator
+from wired_injector.plan import FieldPlan
+from wired_injector.rules import (
+    NOT_FOUND,
+    SKIP,
+    FoundValueField,
+    SkipField,
+    field_make_pipeline,
+)
+
+# The targets being injected by this task and the tasks it waits on.
+# Tasks copy the context when made, so concurrent fields each see
+# their own chain.
+_chain: ContextVar[Tuple[Any, ...]] = ContextVar('chain', default=())
+
+
+@dataclass
+class AsyncInjector(Injector):
+    """An injector which awaits factories, operators and targets.
+
+    It is also a regular ``Injector``, calling it stays synchronous.
+    """
+
+    _tasks: Dict[int, Tuple[Awaitable, 'asyncio.Future']] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_injector(cls, injector: Injector) -> 'AsyncInjector':
+        """ Make an async injector sharing an injector's config """
+
+        return cls(
+            injector.container,
+            rules=injector.rules,
+            plans=injector.plans,
+            compiled=injector.compiled,
+            iterative=injector.iterative,
+            executor=injector.executor,
+            slow_types=injector.slow_types,
+            hook=injector.hook,
+            memo=injector.memo,
+            strict=injector.strict,
+        )
+
+    async def ainject(
+        self,
+        target: Any,
+        system_props: Optional[Mapping[str, Any]] = None,
+        **kwargs,
+    ) -> Any:
+        """ Construct the target, awaiting what needs awaiting """
+
+        chain = _chain.get()
+        if target in chain:
+            raise CycleError(chain[chain.index(target):] + (target,))
+        token = _chain.set(chain + (target,))
+        try:
+            return await self._ainject(target, kwargs, system_props)
+        finally:
+            _chain.reset(token)
+
+    async def _ainject(
+        self,
+        target: Any,
+        props: Mapping[str, Any],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        field_plans = self.plans.get(target, self.rules).field_plans
+        values = [
+            self._start_field(field_plan, props, system_props)
+            for field_plan in field_plans
+        ]
+        waiting = [i for i, value in enumerate(values) if isawaitable(value)]
+        if waiting:
+            done = await asyncio.gather(*[values[i] for i in waiting])
+            for i, value in zip(waiting, done):
+                values[i] = value
+
+        args = {
+            field_plan.field_info.field_name: value
+            for field_plan, value in zip(field_plans, values)
+            if value is not SKIP
+        }
+        # Only field resolution can cycle, see _Resolving.constructing
+        _chain.set(_chain.get()[:-1])
+        result = target(**args)
+        if isawaitable(result):
+            result = await result
+        return result
+
+    def _start_field(
+        self,
+        field_plan: FieldPlan,
+        props: Optional[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]],
+        start: int = 0,
+    ) -> Any:
+        """Apply the rules synchronously until one needs awaiting.
+
+        Return the value, ``SKIP``, or an awaitable of one of those.
+        """
+
+        field_info = field_plan.field_info
+        container = self.container
+        rules = field_plan.rules
+        for index in range(start, len(rules)):
+            rule = rules[index]
+            if rule is field_make_pipeline:
+                this_value = self._make_pipeline(field_plan)
+            else:
+                this_value = rule(field_info, props, container, system_props)
+                if isawaitable(this_value):
+                    return self._finish_rule(
+                        this_value, field_plan, index, props, system_props
+                    )
+            if this_value is not NOT_FOUND:
+                break
+        else:
+            return SKIP
+
+        if isawaitable(this_value):
+            return self._finish_value(this_value)
+        if this_value is not SKIP and isclass(this_value):
+            return self.ainject(this_value)
+        return this_value
+
+    async def _finish_rule(
+        self,
+        awaitable: Awaitable,
+        field_plan: FieldPlan,
+        index: int,
+        props: Optional[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        """ An async rule: await it, then carry on down the rules """
+
+        this_value = await awaitable
+        if this_value is NOT_FOUND:
+            this_value = self._start_field(
+                field_plan, props, system_props, index + 1
+            )
+            if isawaitable(this_value):
+                this_value = await this_value
+            return this_value
+        return await self._finish_value(this_value)
+
+    async def _finish_value(self, this_value: Any) -> Any:
+        if isawaitable(this_value):
+            this_value = await this_value
+        if this_value is not SKIP and isclass(this_value):
+            this_value = await self.ainject(this_value)
+        return this_value
+
+    def _make_pipeline(self, field_plan: FieldPlan) -> Any:
+        """ ``field_make_pipeline`` which can hand back an awaitable """
+
+        field_info = field_plan.field_info
+        if not field_info.pipeline:
+            try:
+                service = self.container.get(field_info.field_type)
+            except (TypeError, LookupError):
+                return SKIP
+            return self._shared(service)
+
+        try:
+            return self._pipeline(
+                field_info.pipeline, field_info.field_type, 0
+            )
+        except SkipField:
+            return SKIP
+        except FoundValueField as exc:
+            return exc.value
+
+    def _pipeline(
+        self, pipeline: Tuple[Operator, ...], result: Any, start: int
+    ) -> Any:
+        """ Run operators until one returns an awaitable """
+
+        container = self.container
+        for index in range(start, len(pipeline)):
+            operator = pipeline[index]
+            if (
+                isinstance(operator, Get)
+                and type(operator).__call__ is Get.__call__
+            ):
+                result = self._get(operator)
+            else:
+                result = operator(result, container)
+            if isawaitable(result):
+                return self._finish_pipeline(pipeline, result, index + 1)
+        return result
+
+    async def _finish_pipeline(
+        self, pipeline: Tuple[Operator, ...], awaitable: Awaitable, start: int
+    ) -> Any:
+        try:
+            result = self._pipeline(pipeline, await awaitable, start)
+            if isawaitable(result):
+                result = await result
+        except SkipField:
+            return SKIP
+        except FoundValueField as exc:
+            return exc.value
+        return result
+
+    def _get(self, operator: Get) -> Any:
+        """ The ``Get`` operator, awaiting and injecting asynchronously """
+
+        try:
+            service = self.container.get(operator.lookup_type)
+        except LookupError:
+            raise SkipField()
+        service = self._shared(service)
+        if isawaitable(service) or isclass(service):
+            return self._finish_get(operator, service)
+        if operator.attr is None:
+            return service
+        return getattr(service, operator.attr)
+
+    async def _finish_get(self, operator: Get, service: Any) -> Any:
+        service = await self._finish_value(service)
+        if operator.attr is None:
+            return service
+        return getattr(service, operator.attr)
+
+    def _shared(self, service: Any) -> Any:
+        """ Await a cached coroutine once, however many fields want it """
+
+        if not isawaitable(service):
+            return service
+        try:
+            return self._tasks[id(service)][1]
+        except KeyError:
+            task = asyncio.ensure_future(service)
+            # Keep the awaitable alive so its id isn't reused
+            self._tasks[id(service)] = (service, task)
+            return task
@@ -0,0 +1,278 @@
+"""
+Turn an injection plan into a specialized Python function.
+
+The injector's generic loop asks every rule about every field, then
+calls the target with a dict of keyword arguments. A compiled plan
+does the same work with straight-line code: the built-in rules are
+inlined, each pipeline is fused into one function, and the
+target is called with positional arguments in a precomputed order.
+
+Results match the injector's loop exactly. Targets which the
+generator can't express, such as those with ``*args``, return
+``None`` and are left to the loop.
+"""
+import linecache
+from inspect import Parameter, isclass, signature
+from itertools import count
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from weakref import finalize
+
+from wired_injector.operators import compile_pipeline
+from wired_injector.rules import (
+    NOT_FOUND,
+    SKIP,
+    FoundValueField,
+    SkipField,
+    always_skip,
+    field_is_in_props,
+    field_make_pipeline,
+    use_container,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from wired_injector.plan import FieldPlan, InjectionPlan
+
+CompiledInjector = Callable[..., Any]
+
+
+class _Missing:
+    """ No rule found a value for this field """
+
+    def __repr__(self):
+        return '<missing>'
+
+
+MISSING = _Missing()
+
+_counter = count()
+
+
+def _found_kwargs(names: Tuple[str, ...], values: Tuple[Any, ...]) -> Dict:
+    """ The keyword args the injector's loop would have collected """
+
+    return {
+        name: value
+        for name, value in zip(names, values)
+        if value is not MISSING
+    }
+
+
+class _Generator:
+    """ Accumulate source lines and the names they refer to """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = dict(
+            MISSING=MISSING,
+            NOT_FOUND=NOT_FOUND,
+            SKIP=SKIP,
+            SkipField=SkipField,
+            FoundValueField=FoundValueField,
+            isclass=isclass,
+            found_kwargs=_found_kwargs,
+        )
+
+    def bind(self, prefix: str, value: Any) -> str:
+        """ Put a value in the function's globals, return its name """
+
+        name = f'{prefix}{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append('    ' * indent + line)
+
+    def rules(
+        self,
+        var: str,
+        field_plan: 'FieldPlan',
+        rules: Tuple[Any, ...],
+        indent: int,
+    ) -> bool:
+        """Emit the rules chain for a field, in order.
+
+        Return True if the chain can leave the field without a value.
+        """
+
+        fi = field_plan.field_info
+        if not rules:
+            self.emit(indent, f'{var} = MISSING')
+            return True
+
+        rule, rest = rules[0], rules[1:]
+        if rule is always_skip:
+            self.emit(indent, f'{var} = MISSING')
+            return True
+
+        if rule is field_is_in_props:
+            name = repr(fi.field_name)
+            self.emit(indent, f'if props and {name} in props:')
+            self.emit(indent + 1, f'{var} = props[{name}]')
+            self.emit(
+                indent, f'elif system_props and {name} in system_props:'
+            )
+            self.emit(indent + 1, f'{var} = system_props[{name}]')
+            self.emit(indent, 'else:')
+            return self.rules(var, field_plan, rest, indent + 1)
+
+        if rule is use_container:
+            self.emit(indent, f'{var} = container')
+            return False
+
+        if rule is field_make_pipeline:
+            return self.pipeline(var, field_plan, indent)
+
+        # A custom rule
+        rule_name = self.bind('rule', rule)
+        fi_name = self.bind('field_info', fi)
+        self.emit(
+            indent,
+            f'{var} = {rule_name}({fi_name}, props, container, system_props)',
+        )
+        self.emit(indent, f'if {var} is NOT_FOUND:')
+        self.rules(var, field_plan, rest, indent + 1)
+        self.emit(indent, f'elif {var} is SKIP:')
+        self.emit(indent + 1, f'{var} = MISSING')
+        return True
+
+    def pipeline(
+        self, var: str, field_plan: 'FieldPlan', indent: int
+    ) -> bool:
+        """ Inline ``field_make_pipeline`` """
+
+        fi = field_plan.field_info
+        if not fi.pipeline:
+            type_name = self.bind('field_type', fi.field_type)
+            self.emit(indent, 'try:')
+            self.emit(indent + 1, f'{var} = container.get({type_name})')
+            self.emit(indent, 'except (TypeError, LookupError):')
+            self.emit(indent + 1, f'{var} = MISSING')
+            return True
+
+        # Get raises SkipField when its lookup fails
+        run = compile_pipeline(fi.pipeline, fi.field_type)
+        run_name = self.bind('pipeline', run)
+        self.emit(indent, 'try:')
+        self.emit(indent + 1, f'{var} = {run_name}(container)')
+        self.emit(indent, 'except SkipField:')
+        self.emit(indent + 1, f'{var} = MISSING')
+        self.emit(indent, 'except FoundValueField as exc:')
+        self.emit(indent + 1, f'{var} = exc.value')
+        return True
+
+    def field(self, var: str, field_plan: 'FieldPlan') -> bool:
+        """ Emit one field, return True if it can end up missing """
+
+        maybe_missing = self.rules(var, field_plan, field_plan.rules, 1)
+        if maybe_missing:
+            self.emit(1, f'if {var} is not MISSING and isclass({var}):')
+        else:
+            self.emit(1, f'if isclass({var}):')
+        self.emit(2, f'{var} = injector({var})')
+        return maybe_missing
+
+
+def compile_plan(
+    target: Any, plan: 'InjectionPlan'
+) -> Optional[CompiledInjector]:
+    """Generate a function which injects ``target`` per its plan.
+
+    The function is called as ``f(target, injector, props,
+    system_props)``. The target is passed in rather than captured,
+    so the plan cache doesn't keep the target alive.
+    """
+
+    try:
+        parameters = signature(target).parameters
+    except (TypeError, ValueError):
+        return None
+
+    for parameter in parameters.values():
+        if parameter.kind not in (
+            Parameter.POSITIONAL_OR_KEYWORD,
+            Parameter.KEYWORD_ONLY,
+        ):
+            return None
+
+    from wired_injector.injector import _resolving
+
+    gen = _Generator()
+    gen.namespace['constructing'] = _resolving.constructing
+    variables: Dict[str, str] = {}
+    maybe_missing: Dict[str, bool] = {}
+    gen.emit(1, 'container = injector.container')
+    for index, field_plan in enumerate(plan.field_plans):
+        fi = field_plan.field_info
+        var = f'v{index}'
+        if fi.field_name not in parameters:
+            # A field the target can't take, e.g. init=False.
+            # Only fine if the field is always skipped.
+            if field_plan.rules[:1] != (always_skip,):
+                return None
+            continue
+        variables[fi.field_name] = var
+        maybe_missing[var] = gen.field(var, field_plan)
+
+    gen.emit(1, 'constructing(target)')
+
+    # Parameters which didn't get a value and have no default
+    names = tuple(variables)
+    required = [
+        variables[name]
+        for name, parameter in parameters.items()
+        if name in variables
+        and maybe_missing[variables[name]]
+        and parameter.default is Parameter.empty
+    ]
+    if required:
+        # Let the target raise its usual TypeError
+        names_name = gen.bind('names', names)
+        values = ', '.join(variables[name] for name in names)
+        missing = ' or '.join(f'{var} is MISSING' for var in required)
+        gen.emit(1, f'if {missing}:')
+        gen.emit(
+            2, f'return target(**found_kwargs({names_name}, ({values},)))'
+        )
+
+    args = []
+    kwargs = []
+    for name, parameter in parameters.items():
+        has_default = parameter.default is not Parameter.empty
+        if name not in variables:
+            if not has_default:
+                # No field at all for a required parameter
+                return None
+            if parameter.kind is Parameter.POSITIONAL_OR_KEYWORD:
+                args.append(gen.bind('default', parameter.default))
+            continue
+        var = variables[name]
+        if maybe_missing[var] and has_default:
+            default_name = gen.bind('default', parameter.default)
+            expr = f'{default_name} if {var} is MISSING else {var}'
+        else:
+            expr = var
+        if parameter.kind is Parameter.POSITIONAL_OR_KEYWORD:
+            args.append(expr)
+        else:
+            kwargs.append(f'{name}={expr}')
+
+    gen.emit(1, f'return target({", ".join(args + kwargs)})')
+
+    name = getattr(target, '__qualname__', type(target).__qualname__)
+    filename = f'<wired_injector {name} {next(_counter)}>'
+    source = '\n'.join(
+        ['def inject(target, injector, props, system_props):'] + gen.lines
+    )
+    code = compile(source, filename, 'exec')
+    exec(code, gen.namespace)
+
+    # Not kept in its own globals, so it's freed with the plan cache entry
+    inject = gen.namespace.pop('inject')
+    inject.__wired_source__ = source
+
+    # Let tracebacks and debuggers show the generated source, for as
+    # long as the function is kept by the plan cache
+    lines = [line + '\n' for line in source.splitlines()]
+    linecache.cache[filename] = (len(source), None, lines, filename)
+    finalize(inject, linecache.cache.pop, filename, None)
+    return inject
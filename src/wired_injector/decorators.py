@@ -20,12 +20,18 @@ class injectable:
 
     for_ = None  # Give subclasses a chance to give default, e.g. view
     use_props = False
+    slow = False
+    memoize = False
+    strict = False
 
     def __init__(
         self,
         for_: type = None,
         context: Type = None,
         use_props: Optional[bool] = None,
+        slow: Optional[bool] = None,
+        memoize: Optional[bool] = None,
+        strict: Optional[bool] = None,
     ):
         if for_ is not None:
             # Use passed in for_ value, otherwise, use the class attr
@@ -33,6 +39,12 @@ class injectable:
         self.context = context
         if use_props is not None:
             self.use_props = use_props
+        if slow is not None:
+            self.slow = slow
+        if memoize is not None:
+            self.memoize = memoize
+        if strict is not None:
+            self.strict = strict
 
     def __call__(self, wrapped):
         def callback(scanner: Scanner, name: str, cls):
@@ -43,6 +55,9 @@ class injectable:
                 target=cls,
                 context=self.context,
                 use_props=self.use_props,
+                slow=self.slow,
+                memoize=self.memoize,
+                strict=self.strict,
             )
 
         attach(wrapped, callback, category='wired')
@@ -9,19 +9,31 @@ downstream.
 
 import inspect
 import sys
-from dataclasses import Field, MISSING
-from inspect import Parameter
-from typing import NamedTuple, Optional, Type, Any, Tuple, Union
+from dataclasses import Field, MISSING, fields, is_dataclass
+from inspect import Parameter, isclass, signature
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
+from wired_injector.markers import Marker
 from wired_injector.operators import Operator
 
-# get_args is augmented in Python 3.9. We need to use
-# typing_extensions if not running on an older version
+# get_args and get_type_hints are augmented in Python 3.9. We need to
+# use typing_extensions if not running on an older version
 if sys.version_info[:3] >= (3, 9):
-    from typing import get_args
+    from typing import get_args, get_type_hints
 else:  # pragma: no cover
     # noinspection PyUnresolvedReferences
-    from typing_extensions import get_args
+    from typing_extensions import get_args, get_type_hints
 
 try:
     from typing import get_origin
@@ -35,6 +47,10 @@ class FieldInfo(NamedTuple):
     default_value: Optional[Any]
     init: bool  # Dataclasses can flag init=False
     pipeline: Tuple[Operator, ...]
+    markers: Tuple[Marker, ...] = ()
+    # default_value can't tell "no default" from a default of None
+    has_default: bool = False
+    default_factory: Optional[Callable[[], Any]] = None
 
 
 def _get_field_origin(field_type: Type) -> Type:
@@ -49,28 +65,33 @@ def _get_field_origin(field_type: Type) -> Type:
 
 
 def _get_pipeline(field_type: Type):
-    """ If using Annotation, get the pipeline information """
-    pipeline = []
+    """ If using Annotation, get the pipeline and markers """
+    metadata = []
     if hasattr(field_type, '__metadata__'):
-        field_type, *pipeline = get_args(field_type)
+        field_type, *metadata = get_args(field_type)
 
-    return field_type, tuple(pipeline)
+    pipeline = tuple(m for m in metadata if not isinstance(m, Marker))
+    markers = tuple(m for m in metadata if isinstance(m, Marker))
+    return field_type, pipeline, markers
 
 
-def function_field_info_factory(parameter: Parameter) -> FieldInfo:
-    field_type = parameter.annotation
+def function_field_info_factory(
+    parameter: Parameter, field_type: Optional[Any] = None
+) -> FieldInfo:
+    """ Pass ``field_type`` when the annotation is a string """
+
+    if field_type is None:
+        field_type = parameter.annotation
 
     # Is this a generic, such as Optional[ServiceContainer]?
     field_type = _get_field_origin(field_type)
 
     # Using Annotation[] ??
-    field_type, pipeline = _get_pipeline(field_type)
+    field_type, pipeline, markers = _get_pipeline(field_type)
 
     # Default values
-    if parameter.default is getattr(inspect, '_empty'):
-        default_value = None
-    else:
-        default_value = parameter.default
+    has_default = parameter.default is not getattr(inspect, '_empty')
+    default_value = parameter.default if has_default else None
 
     return FieldInfo(
         field_name=parameter.name,
@@ -78,20 +99,29 @@ def function_field_info_factory(parameter: Parameter) -> FieldInfo:
         default_value=default_value,
         init=True,
         pipeline=tuple(pipeline),
+        markers=markers,
+        has_default=has_default,
     )
 
 
-def dataclass_field_info_factory(field: Field) -> FieldInfo:
-    field_type = field.type
+def dataclass_field_info_factory(
+    field: Field, field_type: Optional[Any] = None
+) -> FieldInfo:
+    """ Pass ``field_type`` when the annotation is a string """
+
+    if field_type is None:
+        field_type = field.type
 
     # Is this a generic, such as Optional[ServiceContainer]?
     field_type = _get_field_origin(field_type)
 
     # Using Annotation[] ??
-    field_type, pipeline = _get_pipeline(field_type)
+    field_type, pipeline, markers = _get_pipeline(field_type)
 
     # Default values
-    default_value = None if field.default is MISSING else field.default
+    has_default = field.default is not MISSING
+    default_value = field.default if has_default else None
+    default_factory = field.default_factory
 
     return FieldInfo(
         field_name=field.name,
@@ -99,4 +129,155 @@ def dataclass_field_info_factory(field: Field) -> FieldInfo:
         default_value=default_value,
         init=field.init,
         pipeline=tuple(pipeline),
+        markers=markers,
+        has_default=has_default,
+        default_factory=(
+            None if default_factory is MISSING else default_factory
+        ),
+    )
+
+
+_type_hints: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _get_type_hints(target: Any) -> Dict[str, Any]:
+    if is_dataclass(target) or not callable(target):
+        return get_type_hints(target, include_extras=True)
+    if isclass(target):
+        # A NamedTuple's fields or a class's annotated attributes,
+        # then its __init__ parameters
+        hints = get_type_hints(target, include_extras=True)
+        if target.__init__ is not object.__init__:  # type: ignore
+            init = target.__init__  # type: ignore
+            hints.update(get_type_hints(init, include_extras=True))
+        return hints
+    if not inspect.isroutine(target):
+        # An instance with __call__
+        target = type(target).__call__
+    return get_type_hints(target, include_extras=True)
+
+
+def get_cached_type_hints(target: Any) -> Dict[str, Any]:
+    """Evaluated annotations, with ``Annotated`` extras, for a target.
+
+    String annotations, e.g. from ``from __future__ import
+    annotations``, are evaluated against the target's module once
+    and the result is kept. Python 3.14's deferred annotations are
+    evaluated the same way.
+
+    An annotation naming something the module doesn't have, e.g. an
+    import under ``TYPE_CHECKING``, is left as its string and the
+    rest are evaluated one by one. Such hints aren't kept, so a later
+    call can see names added to the module since. Targets which can't
+    be weakly referenced get their hints worked out each time.
+    """
+
+    try:
+        return _type_hints[target]
+    except KeyError:
+        pass
+    except TypeError:
+        # Can't make a weakref to this target
+        return _safe_type_hints(target)
+
+    try:
+        hints = _get_type_hints(target)
+    except (NameError, TypeError, AttributeError):
+        return _safe_type_hints(target)
+    _type_hints[target] = hints
+    return hints
+
+
+def _safe_type_hints(target: Any) -> Dict[str, Any]:
+    try:
+        return _get_type_hints(target)
+    except NameError:
+        # A forward reference to something not importable from the
+        # target's module. Only that field keeps its raw annotation.
+        return _type_hints_by_name(target)
+    except (TypeError, AttributeError):
+        # A target typing can't introspect
+        return {}
+
+
+# Annotations, with the globals and locals to evaluate them in
+AnnotationSource = Tuple[
+    Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]
+]
+
+
+def _annotation_sources(target: Any) -> List[AnnotationSource]:
+    """ What ``get_type_hints`` evaluates, in the same order """
+
+    if isclass(target):
+        sources: List[AnnotationSource] = []
+        for base in reversed(target.__mro__):
+            module = sys.modules.get(base.__module__)
+            sources.append((
+                vars(base).get('__annotations__', {}),
+                getattr(module, '__dict__', {}),
+                dict(vars(base)),
+            ))
+        init = target.__init__  # type: ignore
+        if not is_dataclass(target) and init is not object.__init__:
+            sources.extend(_annotation_sources(init))
+        return sources
+    if not inspect.isroutine(target) and callable(target):
+        # An instance with __call__
+        target = type(target).__call__
+    function = inspect.unwrap(target)
+    return [(
+        getattr(target, '__annotations__', {}),
+        getattr(function, '__globals__', {}),
+        None,
+    )]
+
+
+def _type_hints_by_name(target: Any) -> Dict[str, Any]:
+    """ Evaluate each annotation alone, leaving those that fail as is """
+
+    def one():
+        pass
+
+    hints = {}
+    for annotations, globalns, localns in _annotation_sources(target):
+        for name, annotation in annotations.items():
+            one.__annotations__ = {name: annotation}
+            try:
+                hints[name] = get_type_hints(
+                    one, globalns, localns, include_extras=True
+                )[name]
+            except (NameError, TypeError, AttributeError):
+                hints[name] = annotation
+    return hints
+
+
+def clear_type_hints(target: Any = None) -> None:
+    """ Forget cached hints, for one target or all, e.g. on a reload """
+
+    if target is None:
+        _type_hints.clear()
+        return
+    try:
+        _type_hints.pop(target, None)
+    except TypeError:
+        # Can't make a weakref to this target, so it wasn't cached
+        pass
+
+
+def get_field_infos(target: Any) -> Tuple[FieldInfo, ...]:
+    """ Introspect a dataclass or callable into info for each field """
+
+    type_hints = get_cached_type_hints(target)
+    if is_dataclass(target):
+        # noinspection PyDataclass
+        return tuple(
+            dataclass_field_info_factory(f, type_hints.get(f.name))
+            for f in fields(target)
+        )
+
+    sig = signature(target)
+    return tuple(
+        function_field_info_factory(param, type_hints.get(param.name))
+        for param in sig.parameters.values()
     )
@@ -0,0 +1,265 @@
+"""
+Check and plan every injectable before the first request.
+
+``InjectorRegistry.freeze()``, run after ``scan()``, builds the plan
+for every target given to ``register_injectable`` and looks for what
+would otherwise go wrong on a request: a required field whose type,
+or whose ``Get(...)``, has no registered factory, a pipeline plucking
+an attribute its ``Get(...)`` type doesn't have, and injectables which
+depend on each other in a cycle. ``scan()`` warns about the pipelines.
+"""
+from dataclasses import fields, is_dataclass
+from inspect import Parameter, isclass, signature
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from wired import ServiceContainer
+from wired_injector.field_info import FieldInfo, get_cached_type_hints
+from wired_injector.operators import Attr, Get, Lazy, Provider
+from wired_injector.plan import InjectionPlan
+from wired_injector.rules import (
+    always_skip,
+    has_local_default,
+    is_injected,
+    is_strict,
+)
+
+
+class Injectable(NamedTuple):
+    """ What was given to ``register_injectable`` """
+
+    for_: Any
+    target: Any
+    context: Optional[Any]
+    use_props: bool
+
+
+class Finding(NamedTuple):
+    """ A field which can't be satisfied from the registry """
+
+    target: Any
+    field_name: str
+    message: str
+
+    def __str__(self) -> str:
+        name = getattr(self.target, '__qualname__', repr(self.target))
+        return f'{name}.{self.field_name}: {self.message}'
+
+
+class FreezeReport(NamedTuple):
+    """ What ``freeze`` planned and what it found """
+
+    targets: Tuple[Any, ...]
+    findings: Tuple[Finding, ...]
+    cycles: Tuple[Tuple[Any, ...], ...]
+
+    @property
+    def ok(self) -> bool:
+        return not (self.findings or self.cycles)
+
+    def __str__(self) -> str:
+        lines = [str(finding) for finding in self.findings]
+        for cycle in self.cycles:
+            names = [getattr(t, '__qualname__', repr(t)) for t in cycle]
+            lines.append('Cycle: ' + ' -> '.join(names))
+        return '\n'.join(lines)
+
+
+class PipelineWarning(UserWarning):
+    """ ``scan`` found a pipeline which will fail when injected """
+
+
+class FreezeError(Exception):
+    """ ``freeze(strict=True)`` found problems """
+
+    def __init__(self, report: FreezeReport):
+        super().__init__(str(report))
+        self.report = report
+
+
+# The registry's ``find_factory``, taking the injectable's context
+FindFactory = Callable[..., Any]
+
+
+def _required_names(target: Any) -> Set[str]:
+    try:
+        parameters = signature(target).parameters.values()
+    except (TypeError, ValueError):  # pragma: no cover
+        return set()
+    return {p.name for p in parameters if p.default is Parameter.empty}
+
+
+def _lookup_types(field_info: FieldInfo) -> List[Tuple[Any, bool]]:
+    """What the container is asked for to make this field.
+
+    With whether it is asked while injecting, rather than later by
+    a ``Lazy`` proxy or a ``Provider``, which can't make a cycle.
+    """
+
+    if not field_info.pipeline:
+        return [(field_info.field_type, True)]
+    lookups = []
+    for operator in field_info.pipeline:
+        if isinstance(operator, Get):
+            lookups.append((operator.lookup_type, True))
+        elif isinstance(operator, (Lazy, Provider)):
+            lookup_type = operator.lookup_type or field_info.field_type
+            lookups.append((lookup_type, False))
+    return lookups
+
+
+def _declared_names(cls: Any) -> Optional[Set[str]]:
+    """The attributes a class declares, None if that can't be told.
+
+    Dataclass and NamedTuple fields, and annotated attributes. Plain
+    classes which set attributes in ``__init__`` declare nothing; those
+    without an ``__init__`` have only their class attributes.
+    """
+
+    if not isclass(cls) or hasattr(cls, '__getattr__'):
+        return None
+    names: Set[str] = set(get_cached_type_hints(cls))
+    if is_dataclass(cls):
+        names.update(f.name for f in fields(cls))
+    names.update(getattr(cls, '_fields', ()))
+    if names or cls.__init__ is object.__init__:
+        return names
+    return None
+
+
+def _check_path(cls: Any, path: str) -> Tuple[Any, Optional[str]]:
+    """Follow a dotted attribute path from a class.
+
+    Return the type at the end, if known, and a message if a name on
+    the way isn't an attribute.
+    """
+
+    for name in path.split('.'):
+        names = _declared_names(cls)
+        if names is None:
+            return None, None
+        if name not in names and not hasattr(cls, name):
+            qualname = getattr(cls, '__qualname__', repr(cls))
+            return None, f'{qualname} has no attribute {name!r}'
+        hint = get_cached_type_hints(cls).get(name)
+        cls = hint if isclass(hint) else None
+    return cls, None
+
+
+def check_pipeline(target: Any, field_info: FieldInfo) -> List[Finding]:
+    """``Attr`` names which a preceding ``Get`` type doesn't have.
+
+    The type is followed through each ``Attr`` while its annotations
+    say what the attribute is. Other operators end the check.
+    """
+
+    findings = []
+    current: Any = None
+    for operator in field_info.pipeline:
+        message = None
+        if isinstance(operator, Get):
+            current = operator.lookup_type
+            if operator.attr is not None:
+                current, message = _check_path(current, operator.attr)
+        elif isinstance(operator, Attr) and current is not None:
+            current, message = _check_path(current, operator.name)
+        else:
+            current = None
+        if message is not None:
+            findings.append(
+                Finding(target, field_info.field_name, message)
+            )
+    return findings
+
+
+def check_injectable(
+    injectable: Injectable,
+    plan: InjectionPlan,
+    find_factory: FindFactory,
+    targets: Dict[Any, Any],
+) -> Tuple[List[Finding], List[Any]]:
+    """Return the findings and the injectables this one depends on.
+
+    ``targets`` maps each registered type to its injectable target.
+    A field missing from the container isn't a finding when it has
+    a default or, for ``use_props`` targets, may come from props.
+    """
+
+    findings = []
+    depends_on = []
+    required = _required_names(injectable.target)
+    strict = is_strict(injectable.target)
+    for field_plan in plan.field_plans:
+        field_info = field_plan.field_info
+        if field_plan.rules[:1] == (always_skip,):
+            continue
+        findings.extend(check_pipeline(injectable.target, field_info))
+        if strict and not is_injected(field_info):
+            if field_info.field_name in required and not injectable.use_props:
+                findings.append(
+                    Finding(
+                        injectable.target,
+                        field_info.field_name,
+                        'not looked up in strict mode, mark it Inject()',
+                    )
+                )
+            continue
+        if has_local_default(field_info) and not is_injected(field_info):
+            # Never looked up, so no dependency
+            continue
+        field_type = field_info.field_type
+        if isinstance(field_type, type) and issubclass(
+            field_type, ServiceContainer
+        ):
+            continue
+
+        for lookup_type, eager in _lookup_types(field_info):
+            if lookup_type in targets:
+                if eager:
+                    depends_on.append(targets[lookup_type])
+                continue
+            if lookup_type is injectable.for_:
+                continue
+            try:
+                factory = find_factory(
+                    lookup_type, context=injectable.context
+                )
+            except (TypeError, ValueError):
+                # Not a type wired can look up, e.g. str or List[str]
+                factory = None
+            if factory is not None:
+                continue
+            if injectable.use_props:
+                continue
+            if field_info.field_name in required:
+                name = getattr(lookup_type, '__qualname__', repr(lookup_type))
+                findings.append(
+                    Finding(
+                        injectable.target,
+                        field_info.field_name,
+                        f'no factory registered for {name}',
+                    )
+                )
+    return findings, depends_on
+
+
+def find_cycles(graph: Dict[Any, List[Any]]) -> List[Tuple[Any, ...]]:
+    """ Each cycle as the chain of targets, first target repeated last """
+
+    cycles = []
+    done: Set[int] = set()
+
+    def visit(node: Any, path: List[Any]) -> None:
+        if node in path:
+            cycles.append(tuple(path[path.index(node):]) + (node,))
+            return
+        if id(node) in done:
+            return
+        path.append(node)
+        for dependency in graph.get(node, ()):
+            visit(dependency, path)
+        path.pop()
+        done.add(id(node))
+
+    for node in graph:
+        visit(node, [])
+    return cycles
@@ -0,0 +1,172 @@
+"""
+See where injection time goes.
+
+Set ``Injector.hook`` to an ``InjectionHook`` and it is told how long
+each target, each field and each pipeline operator took, plus how
+each field was resolved. ``HookCollector`` adds those up and reports
+the hottest targets and fields.
+
+With no hook installed, which is the default, injection is unchanged.
+With one, the injector uses the rules loop rather than the compiled
+function, so there is something per field and per operator to time.
+"""
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from wired_injector.field_info import FieldInfo
+from wired_injector.operators import Operator
+
+
+class FieldOutcome(NamedTuple):
+    """ How a field was resolved and how long it took """
+
+    elapsed: float
+    rule: Optional[Any]  # None when no rule had an opinion
+    skipped: bool
+    lookup_error: bool  # A LookupError was swallowed, e.g. by Get
+
+
+class InjectionHook:
+    """Receives timings and outcomes during injection.
+
+    Each method does nothing, subclass and override the ones you
+    need. Times are in seconds, from ``time.perf_counter``, and
+    include nested injections.
+    """
+
+    def on_target(self, target: Any, elapsed: float) -> None:
+        """ A target was injected """
+
+    def on_field(
+        self, target: Any, field_info: FieldInfo, outcome: FieldOutcome
+    ) -> None:
+        """ One of the target's fields was resolved """
+
+    def on_operator(
+        self,
+        target: Any,
+        field_info: FieldInfo,
+        operator: Operator,
+        elapsed: float,
+    ) -> None:
+        """ An operator in a field's pipeline ran """
+
+
+@dataclass
+class Timing:
+    """ Running totals for one target, field, rule or operator """
+
+    count: int = 0
+    total: float = 0.0
+    skipped: int = 0
+    lookup_errors: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+
+
+def _name(value: Any) -> str:
+    return getattr(value, '__qualname__', None) or repr(value)
+
+
+@dataclass
+class HookCollector(InjectionHook):
+    """ Aggregate timings per target, field, rule and operator """
+
+    targets: Dict[Any, Timing] = field(default_factory=dict)
+    fields: Dict[Tuple[Any, str], Timing] = field(default_factory=dict)
+    rules: Dict[str, Timing] = field(default_factory=dict)
+    operators: Dict[str, Timing] = field(default_factory=dict)
+    resolved_by: Dict[Tuple[Any, str], Counter] = field(default_factory=dict)
+    _lock: Any = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def on_target(self, target: Any, elapsed: float) -> None:
+        with self._lock:
+            self.targets.setdefault(target, Timing()).add(elapsed)
+
+    def on_field(
+        self, target: Any, field_info: FieldInfo, outcome: FieldOutcome
+    ) -> None:
+        key = (target, field_info.field_name)
+        rule_name = 'default' if outcome.rule is None else _name(outcome.rule)
+        with self._lock:
+            timing = self.fields.setdefault(key, Timing())
+            timing.add(outcome.elapsed)
+            timing.skipped += outcome.skipped
+            timing.lookup_errors += outcome.lookup_error
+            self.rules.setdefault(rule_name, Timing()).add(outcome.elapsed)
+            self.resolved_by.setdefault(key, Counter())[rule_name] += 1
+
+    def on_operator(
+        self,
+        target: Any,
+        field_info: FieldInfo,
+        operator: Operator,
+        elapsed: float,
+    ) -> None:
+        with self._lock:
+            timing = self.operators.setdefault(repr(operator), Timing())
+            timing.add(elapsed)
+
+    def hottest_targets(self, limit: int = 10) -> List[Tuple[Any, Timing]]:
+        """ Targets sorted by total time, slowest first """
+
+        items = sorted(
+            self.targets.items(), key=lambda i: i[1].total, reverse=True
+        )
+        return items[:limit]
+
+    def hottest_fields(
+        self, limit: int = 10
+    ) -> List[Tuple[Tuple[Any, str], Timing]]:
+        """ (target, field name) pairs sorted by total time """
+
+        items = sorted(
+            self.fields.items(), key=lambda i: i[1].total, reverse=True
+        )
+        return items[:limit]
+
+    def report(self, limit: int = 10) -> str:
+        """ A plain-text table of the hottest targets and fields """
+
+        lines = [
+            f'{"target":<40} {"calls":>8} {"total ms":>10} {"mean us":>10}'
+        ]
+        for target, timing in self.hottest_targets(limit):
+            lines.append(
+                f'{_name(target):<40} {timing.count:>8} '
+                f'{timing.total * 1e3:>10.3f} {timing.mean * 1e6:>10.2f}'
+            )
+        lines.append('')
+        lines.append(
+            f'{"field":<40} {"calls":>8} {"total ms":>10} {"mean us":>10} '
+            f'{"skipped":>8} {"lookup":>8}  resolved by'
+        )
+        for (target, field_name), timing in self.hottest_fields(limit):
+            resolved_by = self.resolved_by[(target, field_name)]
+            rule_names = ', '.join(
+                f'{name} x{count}' for name, count in resolved_by.most_common()
+            )
+            lines.append(
+                f'{_name(target) + "." + field_name:<40} {timing.count:>8} '
+                f'{timing.total * 1e3:>10.3f} {timing.mean * 1e6:>10.2f} '
+                f'{timing.skipped:>8} {timing.lookup_errors:>8}  {rule_names}'
+            )
+        return '\n'.join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.targets.clear()
+            self.fields.clear()
+            self.rules.clear()
+            self.operators.clear()
+            self.resolved_by.clear()
@@ -1,122 +1,126 @@
-import sys
+import threading
 import typing
-from dataclasses import dataclass, is_dataclass, fields
-from inspect import signature, getmodule, isclass
-from typing import Dict, NamedTuple, Tuple, Type, Any, Optional
+from time import perf_counter
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from inspect import getmodule, isclass
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from wired import ServiceContainer
-from wired_injector.field_info import (
-    function_field_info_factory,
-    dataclass_field_info_factory,
-    FieldInfo,
+from wired_injector.field_info import FieldInfo
+from wired_injector.hooks import FieldOutcome, InjectionHook
+from wired_injector.markers import Slow
+from wired_injector.memo import MemoCache
+from wired_injector.operators import Get
+from wired_injector.plan import FieldPlan, InjectionPlan, PlanCache
+from wired_injector.rules import (  # noqa: F401
+    NOT_FOUND,
+    SKIP,
+    SkipField,
+    FoundValueField,
+    FieldIsInit,
+    FieldIsInProps,
+    FieldIsContainer,
+    FieldMakePipeline,
+    field_is_init,
+    field_is_in_props,
+    field_is_container,
+    field_make_pipeline,
+    strict_rules,
 )
-from wired_injector.operators import process_pipeline
-
-# get_type_hints is augmented in Python 3.9. We need to use
-# typing_extensions if not running on an older version
-if sys.version_info[:3] >= (3, 9):
-    from typing import get_type_hints
-else:  # pragma: no cover
-    from typing_extensions import get_type_hints
 
+# Set in threads resolving a slow field, which then resolve their
+# own slow fields inline rather than wait on the pool they're in.
+_worker = threading.local()
 
-class SkipField(BaseException):
-    """Not part of construction.
 
-    Tell the injector that this field should not be part of
-    construction. Used for example on a dataclass field with
-    field(init=False).
-    """
+class CycleError(RecursionError):
+    """ A target needs, directly or not, an instance of itself """
 
-    pass
+    def __init__(self, chain: Sequence[Any]):
+        self.chain = tuple(chain)
+        names = [getattr(t, '__qualname__', repr(t)) for t in self.chain]
+        super().__init__('Dependency cycle: ' + ' -> '.join(names))
 
 
-class FoundValueField(BaseException):
-    """Found a value for the field.
+class ResolutionScope:
+    """What one top-level injection has looked up, per thread.
 
-    If a rule matches a condition and finds a value, return
-    the value as the exception value, then put it in the
-    args for that field.
+    Opened when ``Injector.__call__`` is entered with nothing else
+    being injected in the thread and emptied when it returns. While it
+    is open, containers sharing the injector's instance cache, such as
+    those bound to another context, memoize ``get`` by type, name and
+    context. Nested injections, ``Get`` and the implicit lookups of
+    fields then ask wired once per service.
     """
 
-    def __init__(self, *args):
-        self.value = args[0] if args else None
+    __slots__ = ('injector', 'cache', 'services')
 
+    def __init__(self) -> None:
+        self.injector: Optional['Injector'] = None
+        # The open scope's container cache, None when closed
+        self.cache: Any = None
+        self.services: Dict[Tuple[Any, str, int], Any] = {}
 
-class FieldIsInit(NamedTuple):
-    """ If this is a dataclass field with init=False, skip """
+    def open(self, injector: 'Injector') -> None:
+        self.injector = injector
+        self.cache = getattr(injector.container, '_cache', None)
 
-    field_info: FieldInfo
-    props: Dict
-    container: ServiceContainer
-    system_props: Optional[Dict] = None
+    def close(self) -> None:
+        self.injector = self.cache = None
+        self.services.clear()
 
-    def __call__(self):
-        if self.field_info.init is False:
-            raise SkipField()
 
+class _Resolving(threading.local):
+    """ The targets being injected in this thread, outermost first """
 
-class FieldIsInProps(NamedTuple):
-    """ If field in passed-in props or system props, return value """
+    def __init__(self) -> None:
+        self.targets: List[Any] = []
+        self.ids: Set[int] = set()
+        self.scope = ResolutionScope()
 
-    field_info: FieldInfo
-    props: Dict
-    container: ServiceContainer
-    system_props: Optional[Dict] = None
-
-    def __call__(self):
-        if self.props and self.field_info.field_name in self.props:
-            # Props have precedence
-            prop_value = self.props[self.field_info.field_name]
-            raise FoundValueField(prop_value)
-        elif (
-            self.system_props
-            and self.field_info.field_name in self.system_props
-        ):
-            # If the "system" passes in props behind the scenes, use it
-            prop_value = self.system_props[self.field_info.field_name]
-            raise FoundValueField(prop_value)
-
-
-class FieldIsContainer(NamedTuple):
-    """ If the field is asking for a ServiceContainer, return it """
-
-    field_info: FieldInfo
-    props: Dict
-    container: ServiceContainer
-    system_props: Optional[Dict] = None
+    def cycle(self, target: Any) -> CycleError:
+        # The innermost, a target calling the injector from its own
+        # constructor can be in the list more than once
+        index = len(self.targets) - 1
+        while self.targets[index] is not target:
+            index -= 1
+        return CycleError(self.targets[index:] + [target])
 
-    def __call__(self):
-        if self.field_info.field_type is ServiceContainer:
-            raise FoundValueField(self.container)
+    def push(self, target: Any) -> None:
+        if id(target) in self.ids:
+            raise self.cycle(target)
+        self.ids.add(id(target))
+        self.targets.append(target)
 
+    def pop(self) -> None:
+        self.ids.discard(id(self.targets.pop()))
 
-class FieldMakePipeline(NamedTuple):
-    """ If pipeline, process it, else, bail out """
+    def constructing(self, target: Any) -> None:
+        """The target's fields are resolved, it's about to be called.
 
-    field_info: FieldInfo
-    props: Dict
-    container: ServiceContainer
-    system_props: Optional[Dict] = None
-
-    def __call__(self):
-        fi = self.field_info
-        c = self.container
-        if not fi.pipeline:
-            if getmodule(fi.field_type) is typing:
-                # Test this because, when you have a field like:
-                #   names: Tuple[str, ...] = ('Name 1',)
-                # ...then wired tries to do obj.__qualname__ and fails
-                raise SkipField()
-            try:
-                fv = c.get(fi.field_type)
-            except (TypeError, LookupError):
-                # We're probably looking up something like str. Since
-                # we might have a default value, let's skip this.
-                raise SkipField()
-        else:
-            fv = process_pipeline(c, fi.pipeline, fi.field_type)
-        raise FoundValueField(fv)
+        Only field resolution can cycle. A target which injects more
+        of its own type, e.g. children in ``__post_init__``, recurses
+        only as deep as its own code does.
+        """
+
+        self.ids.discard(id(target))
+
+
+_resolving = _Resolving()
 
 
 @dataclass
@@ -127,16 +131,66 @@ class Injector:
     needed for a factory, then call it. The injector is a per-container
     service.
 
-
+    Introspecting a target is done once and kept in ``plans``, so
+    repeat injections only do the container lookups. The plan is
+    then turned into a generated function for the target. Pass
+    ``compiled=False`` to use the rules loop instead, e.g. when
+    stepping through injection in a debugger.
+
+    Each of the ``rules`` returns a found value, ``SKIP``, or
+    ``NOT_FOUND``. Rule classes which raise ``SkipField`` or
+    ``FoundValueField`` are still accepted.
+
+    With an ``executor``, fields marked ``Slow()`` or whose type is in
+    ``slow_types`` are resolved on the executor while the target's
+    other fields are resolved in the calling thread.
+
+    A ``hook``, e.g. a ``HookCollector``, is told the time taken by
+    each target, field and pipeline operator, and how each field was
+    resolved.
+
+    With ``iterative=True``, classes found for fields, including by
+    ``Get``, are built from an explicit stack rather than by calling
+    the injector again. Each such class is built once per call and
+    shared by every field needing it, and deep graphs don't use up
+    the recursion limit. Injectables made by the container's factories
+    are still made, and cached, by the container.
+
+    Targets in the ``memo``'s targets are built once per context class
+    and props, then the instance is reused.
+
+    With ``strict=True``, only fields marked ``Inject()``, having a
+    pipeline or wanting the container are looked up. Other fields come
+    from props or their default.
     """
 
     container: ServiceContainer
-    rules: Tuple[Type[Any], ...] = (
-        FieldIsInit,
-        FieldIsInProps,
-        FieldIsContainer,
-        FieldMakePipeline,
+    rules: Tuple[Any, ...] = (
+        field_is_init,
+        field_is_in_props,
+        field_is_container,
+        field_make_pipeline,
+    )
+    plans: PlanCache = field(
+        default_factory=PlanCache, repr=False, compare=False
+    )
+    compiled: bool = True
+    iterative: bool = False
+    executor: Optional[Executor] = field(
+        default=None, repr=False, compare=False
     )
+    slow_types: AbstractSet[Any] = frozenset()
+    hook: Optional[InjectionHook] = field(
+        default=None, repr=False, compare=False
+    )
+    memo: Optional[MemoCache] = field(
+        default=None, repr=False, compare=False
+    )
+    strict: bool = False
+
+    def __post_init__(self) -> None:
+        if self.strict:
+            self.rules = strict_rules(self.rules)
 
     def __call__(
         self,
@@ -145,43 +199,414 @@ class Injector:
         **kwargs,
     ) -> Any:
 
+        # Nested injection comes back through here, so a target
+        # already being injected in this thread means a cycle.
+        resolving = _resolving
+        key = id(target)
+        if key in resolving.ids:
+            raise resolving.cycle(target)
+        outermost = not resolving.targets
+        if outermost:
+            resolving.scope.open(self)
+        resolving.ids.add(key)
+        resolving.targets.append(target)
+        try:
+            memo = self.memo
+            if memo is not None and target in memo.targets:
+                context_class = type(self.container.context)
+                return memo.call(
+                    self._inject, target, context_class, kwargs, system_props
+                )
+            return self._inject(target, kwargs, system_props)
+        finally:
+            resolving.ids.discard(key)
+            resolving.targets.pop()
+            if outermost:
+                resolving.scope.close()
+
+    def _inject(
+        self,
+        target: Any,
+        props: Mapping[str, Any],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        if self.hook is not None:
+            return self._inject_hooked(self.hook, target, props, system_props)
+
+        executor = self.executor
+        if executor is not None and not getattr(_worker, 'busy', False):
+            plan = self.plans.get(target, self.rules)
+            if any(self._is_slow(fp) for fp in plan.field_plans):
+                return self._inject_parallel(
+                    executor, target, plan, props, system_props
+                )
+
+        if self.iterative:
+            return self._inject_iterative(target, props, system_props)
+
+        if self.compiled:
+            inject = self.plans.get_compiled(target, self.rules)
+            if inject is not None:
+                return inject(target, self, props, system_props)
+
         args = {}
-        props = kwargs
-        if is_dataclass(target):
-            type_hints = get_type_hints(target, include_extras=True)
-            # noinspection PyDataclass
-            fields_mapping = {f.name: f for f in fields(target)}
-            field_infos = [
-                dataclass_field_info_factory(fields_mapping[field_name])
-                for field_name in type_hints
-            ]
-        else:
-            sig = signature(target)
-            parameters = sig.parameters.values()
-            field_infos = [
-                function_field_info_factory(param) for param in parameters
-            ]
+        plan = self.plans.get(target, self.rules)
 
         # Go through each field and apply policies
-        for field_info in field_infos:
-            field_name = field_info.field_name
+        for field_plan in plan.field_plans:
+            this_value = self._resolve_field(field_plan, props, system_props)
+            if this_value is not SKIP:
+                args[field_plan.field_info.field_name] = this_value
 
-            try:
-                for rule in self.rules:
-                    # noinspection PyArgumentList
-                    r = rule(field_info, props, self.container, system_props)
-                    # noinspection PyCallingNonCallable
-                    r()
-            except SkipField:
+        _resolving.constructing(target)
+        return target(**args)
+
+    def inject_many(
+        self,
+        target: Any,
+        props_seq: Iterable[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]] = None,
+    ) -> List[Any]:
+        """Inject ``target`` once per mapping of props.
+
+        A field which isn't in a row's props is resolved the first
+        time it is needed, then shared by the rest of the rows. Rows
+        then mostly cost the call to the target.
+        """
+
+        return list(self.inject_iter(target, props_seq, system_props))
+
+    def inject_iter(
+        self,
+        target: Any,
+        props_iterable: Iterable[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator[Any]:
+        """Yield an injected ``target`` for each mapping of props.
+
+        Same as ``inject_many`` but lazy: rows are pulled from the
+        iterable, e.g. a database cursor, one at a time and nothing
+        is kept but the shared field values.
+        """
+
+        plan = self.plans.get(target, self.rules)
+        field_plans = plan.field_plans
+        shared: Dict[str, Any] = {}
+        for props in props_iterable:
+            args = {}
+            for field_plan in field_plans:
+                field_name = field_plan.field_info.field_name
+                if props and field_name in props:
+                    this_value = self._resolve_field(
+                        field_plan, props, system_props
+                    )
+                else:
+                    try:
+                        this_value = shared[field_name]
+                    except KeyError:
+                        this_value = shared[field_name] = self._resolve_field(
+                            field_plan, None, system_props
+                        )
+                if this_value is not SKIP:
+                    args[field_name] = this_value
+            yield target(**args)
+
+    def _inject_iterative(
+        self,
+        target: Any,
+        props: Mapping[str, Any],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        """Build the target and the classes it needs without recursing.
+
+        Each node is a ``_build`` generator, which yields the classes
+        it needs and is sent their instances. A class is built once,
+        then the instance is sent to every node which yields it.
+        """
+
+        resolving = _resolving
+        depth = len(resolving.targets)
+        built: Dict[Any, Any] = {}
+        stack = [(target, self._build(target, props, system_props))]
+        value = None
+        try:
+            while True:
+                node, builder = stack[-1]
+                try:
+                    needed = builder.send(value)
+                except StopIteration as exc:
+                    value = exc.value
+                    stack.pop()
+                    if not stack:
+                        return value
+                    built[node] = value
+                    resolving.pop()
+                    continue
+
+                try:
+                    value = built[needed]
+                except KeyError:
+                    resolving.push(needed)
+                    stack.append((needed, self._build(needed, None, None)))
+                    value = None
+        finally:
+            # Only left over when a node raised
+            while len(resolving.targets) > depth:
+                resolving.pop()
+
+    def _build(
+        self,
+        target: Any,
+        props: Optional[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Generator[Any, Any, Any]:
+        """ Resolve the fields, yielding classes to be built """
+
+        args = {}
+        container = self.container
+        for field_plan in self.plans.get(target, self.rules).field_plans:
+            field_info = field_plan.field_info
+            for rule in field_plan.rules:
+                if rule is field_make_pipeline and field_info.pipeline:
+                    this_value = yield from self._build_pipeline(field_info)
+                else:
+                    this_value = rule(
+                        field_info, props, container, system_props
+                    )
+                if this_value is not NOT_FOUND:
+                    break
+            else:
                 continue
-            except FoundValueField as exc:
-                this_value = exc.value
-                if isclass(this_value):
-                    # This "service" is actually injectable, instead of
-                    # a plain factory. At the moment, we just have a class.
-                    # Use this injector instance to turn it into an instance.
-                    this_value = self(this_value)
+
+            if this_value is not SKIP and isclass(this_value):
+                this_value = yield this_value
+            if this_value is not SKIP:
+                args[field_info.field_name] = this_value
+
+        _resolving.constructing(target)
+        return target(**args)
+
+    def _build_pipeline(
+        self, field_info: FieldInfo
+    ) -> Generator[Any, Any, Any]:
+        """ The pipeline, with ``Get`` yielding a class to be built """
+
+        container = self.container
+        result = field_info.field_type
+        try:
+            for operator in field_info.pipeline:
+                # Get subclasses with their own __call__ are called
+                if (
+                    not isinstance(operator, Get)
+                    or type(operator).__call__ is not Get.__call__
+                ):
+                    result = operator(result, container)
+                    continue
+                try:
+                    service = container.get(operator.lookup_type)
+                except LookupError:
+                    return SKIP
+                if isclass(service):
+                    service = yield service
+                if operator.attr is None:
+                    result = service
+                else:
+                    result = getattr(service, operator.attr)
+        except SkipField:
+            return SKIP
+        except FoundValueField as exc:
+            return exc.value
+        return result
+
+    def _is_slow(self, field_plan: FieldPlan) -> bool:
+        field_info = field_plan.field_info
+        if field_info.field_type in self.slow_types:
+            return True
+        return any(isinstance(m, Slow) for m in field_info.markers)
+
+    def _inject_parallel(
+        self,
+        executor: Executor,
+        target: Any,
+        plan: InjectionPlan,
+        props: Mapping[str, Any],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        """ Send slow fields to the executor, do the rest meanwhile """
+
+        # An InjectorContainer makes each service once across threads
+        parallel = getattr(self.container, 'parallel', None)
+        if parallel is None:
+            values = self._resolve_parallel(
+                executor, plan, props, system_props
+            )
+        else:
+            with parallel():
+                values = self._resolve_parallel(
+                    executor, plan, props, system_props
+                )
+
+        args = {}
+        for field_plan in plan.field_plans:
+            field_name = field_plan.field_info.field_name
+            this_value = values[field_name]
+            if this_value is not SKIP:
                 args[field_name] = this_value
-                continue
 
+        _resolving.constructing(target)
         return target(**args)
+
+    def _resolve_parallel(
+        self,
+        executor: Executor,
+        plan: InjectionPlan,
+        props: Mapping[str, Any],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        pending = {}
+        for field_plan in plan.field_plans:
+            field_name = field_plan.field_info.field_name
+            if self._is_slow(field_plan):
+                pending[field_name] = executor.submit(
+                    self._resolve_slow_field, field_plan, props, system_props
+                )
+            else:
+                values[field_name] = self._resolve_field(
+                    field_plan, props, system_props
+                )
+        for field_name, future in pending.items():
+            values[field_name] = future.result()
+        return values
+
+    def _resolve_slow_field(
+        self,
+        field_plan: FieldPlan,
+        props: Optional[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        _worker.busy = True
+        try:
+            return self._resolve_field(field_plan, props, system_props)
+        finally:
+            _worker.busy = False
+
+    def _resolve_field(
+        self,
+        field_plan: FieldPlan,
+        props: Optional[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        """ Apply the field's rules, return the value or ``SKIP`` """
+
+        field_info = field_plan.field_info
+        container = self.container
+        for rule in field_plan.rules:
+            this_value = rule(field_info, props, container, system_props)
+            if this_value is not NOT_FOUND:
+                break
+        else:
+            # No rule had an opinion, the field keeps its default
+            return SKIP
+
+        if this_value is not SKIP and isclass(this_value):
+            # This "service" is actually injectable, instead of
+            # a plain factory. At the moment, we just have a class.
+            # Use this injector instance to turn it into an instance.
+            this_value = self(this_value)
+        return this_value
+
+    def _inject_hooked(
+        self,
+        hook: InjectionHook,
+        target: Any,
+        props: Mapping[str, Any],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        """ The rules loop, timing the target, fields and operators """
+
+        start = perf_counter()
+        args = {}
+        plan = self.plans.get(target, self.rules)
+        for field_plan in plan.field_plans:
+            this_value = self._resolve_field_hooked(
+                hook, target, field_plan, props, system_props
+            )
+            if this_value is not SKIP:
+                args[field_plan.field_info.field_name] = this_value
+
+        _resolving.constructing(target)
+        result = target(**args)
+        hook.on_target(target, perf_counter() - start)
+        return result
+
+    def _resolve_field_hooked(
+        self,
+        hook: InjectionHook,
+        target: Any,
+        field_plan: FieldPlan,
+        props: Optional[Mapping[str, Any]],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        start = perf_counter()
+        field_info = field_plan.field_info
+        container = self.container
+        lookup_error = False
+        for rule in field_plan.rules:
+            if rule is field_make_pipeline:
+                this_value, lookup_error = self._make_pipeline_hooked(
+                    hook, target, field_info
+                )
+            else:
+                this_value = rule(field_info, props, container, system_props)
+            if this_value is not NOT_FOUND:
+                break
+        else:
+            rule = None
+            this_value = SKIP
+
+        if this_value is not SKIP and isclass(this_value):
+            this_value = self(this_value)
+        outcome = FieldOutcome(
+            elapsed=perf_counter() - start,
+            rule=rule,
+            skipped=this_value is SKIP,
+            lookup_error=lookup_error,
+        )
+        hook.on_field(target, field_info, outcome)
+        return this_value
+
+    def _make_pipeline_hooked(
+        self, hook: InjectionHook, target: Any, field_info: FieldInfo
+    ) -> Tuple[Any, bool]:
+        """``field_make_pipeline``, timing each operator.
+
+        Also return whether a ``LookupError`` was swallowed.
+        """
+
+        container = self.container
+        if not field_info.pipeline:
+            if getmodule(field_info.field_type) is typing:
+                return SKIP, False
+            try:
+                return container.get(field_info.field_type), False
+            except TypeError:
+                return SKIP, False
+            except LookupError:
+                return SKIP, True
+
+        result = field_info.field_type
+        try:
+            for operator in field_info.pipeline:
+                start = perf_counter()
+                try:
+                    result = operator(result, container)
+                finally:
+                    elapsed = perf_counter() - start
+                    hook.on_operator(target, field_info, operator, elapsed)
+        except SkipField as exc:
+            # Get turns the LookupError into a SkipField
+            return SKIP, isinstance(exc.__context__, LookupError)
+        except FoundValueField as exc:
+            return exc.value, False
+        return result, False
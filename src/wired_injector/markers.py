@@ -0,0 +1,31 @@
+"""
+Markers are ``Annotated`` metadata which configure injection.
+
+Operators in an ``Annotated`` make up the pipeline which computes a
+field's value. Markers instead tell the injector how to treat the
+field. They are kept apart from the pipeline, in ``FieldInfo.markers``.
+"""
+from dataclasses import dataclass
+
+
+class Marker:
+    """ ``Annotated`` metadata which isn't part of the pipeline """
+
+
+@dataclass(frozen=True)
+class Inject(Marker):
+    """Look this field up in the container, also in strict mode.
+
+    Strict injectors, and targets registered with ``strict=True``,
+    only look up fields with a pipeline, the container itself, or
+    this marker. Other fields come from props or their default.
+    """
+
+
+@dataclass(frozen=True)
+class Slow(Inject):
+    """Resolve this field on the registry's thread pool.
+
+    For fields whose factories do blocking I/O. Only has an effect
+    when the injector has an ``executor``.
+    """
@@ -0,0 +1,94 @@
+"""
+Reuse instances of pure components across injections.
+
+A component registered with ``memoize=True`` is taken to depend only
+on its props, its system props and services which are the same for
+every container, such as registry singletons. Its instances can then
+be kept by the registry, keyed on the target, the container's context
+class and the props, and handed out again instead of rebuilt.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Mapping, NamedTuple, Optional, Set, Tuple
+
+
+class MemoInfo(NamedTuple):
+    """ Like ``functools.lru_cache``'s ``cache_info()`` """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _fingerprint(props: Optional[Mapping[str, Any]]) -> Tuple:
+    if not props:
+        return ()
+    return tuple(sorted(props.items()))
+
+
+class MemoCache:
+    """A bounded LRU of injected instances, owned by a registry.
+
+    Only targets in ``targets`` are memoized. Props which can't be
+    hashed mean the instance is built as usual and not kept.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.targets: Set[Any] = set()
+        self.hits = 0
+        self.misses = 0
+        self._instances: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        make: Callable[..., Any],
+        target: Any,
+        context_class: type,
+        props: Mapping[str, Any],
+        system_props: Optional[Mapping[str, Any]],
+    ) -> Any:
+        """ The kept instance, else ``make(target, props, system_props)`` """
+
+        try:
+            key = (
+                target,
+                context_class,
+                _fingerprint(props),
+                _fingerprint(system_props),
+            )
+            hash(key)
+        except TypeError:
+            # Unhashable or unorderable props
+            return make(target, props, system_props)
+
+        instances = self._instances
+        with self._lock:
+            try:
+                instance = instances[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                instances.move_to_end(key)
+                return instance
+
+        instance = make(target, props, system_props)
+        with self._lock:
+            instances[key] = instance
+            if len(instances) > self.maxsize:
+                instances.popitem(last=False)
+        return instance
+
+    def cache_info(self) -> MemoInfo:
+        return MemoInfo(
+            self.hits, self.misses, self.maxsize, len(self._instances)
+        )
+
+    def clear(self) -> None:
+        """ Forget the instances, e.g. when the registry changes """
+
+        with self._lock:
+            self._instances.clear()
@@ -0,0 +1,62 @@
+"""
+Remember lookups which can't succeed.
+
+A field such as ``name: str = 'x'`` has the container asked for
+``str`` on every injection. wired then makes, and fails to cache, an
+interface for ``str`` and raises ``TypeError``. Types with no factory
+raise ``LookupError`` after a failed adapter lookup. Either way the
+field is skipped, at a cost which is the same every time.
+
+The registry keeps the failures, keyed by type, what the context
+provides and name, and its containers raise the same error straight
+away. Any registration on the registry forgets them all.
+"""
+from typing import Any, Dict, Optional, Tuple, Type
+
+from wired.container import IServiceFactory, _iface_for_type
+from zope.interface.adapter import AdapterRegistry
+
+# The looked up type, ``providedBy(context)`` and the name. wired
+# matches factories on what the context provides, which an instance
+# can extend with ``alsoProvides``, so its class isn't enough.
+MissKey = Tuple[Any, Any, str]
+
+
+class MissCache:
+    """ Failed lookups and the exception class they raised """
+
+    def __init__(self, factories: AdapterRegistry) -> None:
+        # The registry's factories
+        self.factories = factories
+        self._errors: Dict[MissKey, Type[Exception]] = {}
+
+    def get(self, key: MissKey) -> Optional[Type[Exception]]:
+        return self._errors.get(key)
+
+    def add(self, key: MissKey, error: Exception) -> None:
+        """Keep a failed lookup, if the failure was the lookup's own.
+
+        A factory which fails its own lookups raises the same errors
+        through ``container.get``, so check the registry has nothing
+        for this type, the way the container looks it up.
+        """
+
+        lookup_type, provided, name = key
+        try:
+            factory = self.factories.lookup(
+                (IServiceFactory, provided),
+                _iface_for_type(lookup_type),
+                name=name,
+                default=None,
+            )
+        except (TypeError, ValueError):
+            # e.g. str, or a string instead of a type
+            factory = None
+        if factory is None:
+            self._errors[key] = type(error)
+
+    def clear(self) -> None:
+        self._errors.clear()
+
+    def __len__(self) -> int:
+        return len(self._errors)
@@ -1,20 +1,57 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, is_dataclass
+from functools import lru_cache
 from inspect import isclass
-from typing import Type, Any, Tuple, Optional
+from operator import attrgetter, itemgetter, methodcaller
+from typing import Type, Any, Callable, Dict, List, Tuple, Optional
 
 from wired import ServiceContainer
 
+# (previous, container) -> value, what an operator does when called
+Step = Callable[[Any, ServiceContainer], Any]
+
+# container -> the field's value, a whole pipeline fused
+CompiledPipeline = Callable[[ServiceContainer], Any]
+
+# previous -> value, for operators which don't need the container
+Getter = Callable[[Any], Any]
+
 
 # TODO Operator should be a Protocol but the typechecker then says a usage
 #   in an annotation should be a generic.
 
 
-class Operator:  # pragma: no cover
+class Operator:
     """ Part of a pipeline for field construction """
 
-    def __call__(self, previous: Any, container: ServiceContainer) -> Any:
+    def __call__(
+        self, previous: Any, container: ServiceContainer
+    ) -> Any:  # pragma: no cover
         ...
 
+    def compile(self) -> Step:
+        """Return a function doing what calling the operator does.
+
+        Called once, when the pipeline is compiled. Override to look
+        up attributes and bind arguments ahead of time.
+        """
+
+        getter = self.getter() if _compiles_call(self, 'getter') else None
+        if getter is not None:
+            return _getter_step([getter])
+        return self
+
+    def getter(self) -> Optional[Getter]:
+        """Return a function of the previous value alone, if possible.
+
+        Operators which only transform the value coming in, such as
+        ``Attr`` and ``Key``, return one, usually from the ``operator``
+        module. The pipeline compiler folds a run of them into one
+        step. The default, ``None``, means the operator needs the
+        container and is compiled on its own.
+        """
+
+        return None
+
 
 @dataclass(frozen=True)
 class Get(Operator):
@@ -26,15 +63,9 @@ class Get(Operator):
 
     def __call__(self, previous: Type, container: ServiceContainer):
         try:
-            service = container.get(self.lookup_type)
-            if isclass(service):
-                # This "service" is actually injectable, instead of
-                # a plain factory. At the moment, we just have a class.
-                # Use this injector instance to turn it into an instance.
-                from wired_injector import Injector
-
-                injector = container.get(Injector)
-                service = injector(service)
+            # A class the container hands back is an injectable,
+            # made by the injector of the injection in progress
+            service = _make(container, self.lookup_type)
             if self.attr is None:
                 return service
             else:
@@ -43,21 +74,116 @@ class Get(Operator):
             # We don't want to just crash with a LookupError, as the
             # field might have a default. Thus, bail out of processing
             # the pipeline.
-            from wired_injector.injector import SkipField
+            from wired_injector.rules import SkipField
 
             raise SkipField()
 
+    def compile(self) -> Step:
+        from wired_injector.rules import SkipField
+
+        lookup_type = self.lookup_type
+        attr = self.attr
+
+        def get(previous: Any, container: ServiceContainer) -> Any:
+            try:
+                service = _make(container, lookup_type)
+                if attr is None:
+                    return service
+                return getattr(service, attr)
+            except LookupError:
+                raise SkipField()
+
+        return get
+
 
 @dataclass(frozen=True)
 class Attr(Operator):
-    """ Pluck an attribute off the object coming in """
+    """Pluck an attribute off the object coming in.
+
+    The name can be a dotted path, ``Attr('customer.address.city')``.
+    """
 
     __slots__ = ('name',)
     name: str
 
     def __call__(self, previous: Any, container: ServiceContainer):
+        if '.' in self.name:
+            return attrgetter(self.name)(previous)
         return getattr(previous, self.name)
 
+    def getter(self) -> Getter:
+        return attrgetter(self.name)
+
+
+@dataclass(frozen=True)
+class Key(Operator):
+    """ Look up a key, or index, in the object coming in """
+
+    key: Any
+
+    def __call__(self, previous: Any, container: ServiceContainer):
+        return previous[self.key]
+
+    def getter(self) -> Getter:
+        return itemgetter(self.key)
+
+
+@dataclass(frozen=True, init=False)
+class Call(Operator):
+    """Call a method on the object coming in.
+
+    ``Call('format', 'short', sep='-')`` returns
+    ``previous.format('short', sep='-')``.
+    """
+
+    name: str
+    args: Tuple[Any, ...]
+    kwargs: Tuple[Tuple[str, Any], ...]
+
+    def __init__(self, name: str, *args: Any, **kwargs: Any):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'args', args)
+        # As items, so the operator can be hashed
+        object.__setattr__(self, 'kwargs', tuple(kwargs.items()))
+
+    def __call__(self, previous: Any, container: ServiceContainer):
+        method = getattr(previous, self.name)
+        return method(*self.args, **dict(self.kwargs))
+
+    def getter(self) -> Getter:
+        return methodcaller(self.name, *self.args, **dict(self.kwargs))
+
+
+@lru_cache(maxsize=256)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    if is_dataclass(cls):
+        return tuple(f.name for f in fields(cls))
+    try:
+        # NamedTuple
+        return getattr(cls, '_fields')
+    except AttributeError:
+        raise TypeError(f'AsDict needs a dataclass or NamedTuple, not {cls}')
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    cls: Any = type(value)
+    return {name: getattr(value, name) for name in _field_names(cls)}
+
+
+@dataclass(frozen=True)
+class AsDict(Operator):
+    """Turn the dataclass or NamedTuple coming in into a dict.
+
+    Unlike ``dataclasses.asdict``, values aren't copied or converted,
+    the dict holds the instance's own field values.
+    """
+
+    def __call__(self, previous: Any, container: ServiceContainer):
+        return _as_dict(previous)
+
+    def getter(self) -> Getter:
+        return _as_dict
+
 
 @dataclass(frozen=True)
 class Context(Operator):
@@ -66,17 +192,244 @@ class Context(Operator):
     def __call__(self, previous: Any, container: ServiceContainer):
         return container.context
 
+    def compile(self) -> Step:
+        def context(previous: Any, container: ServiceContainer) -> Any:
+            return container.context
+
+        return context
+
+
+def _active_injector(container: ServiceContainer) -> Any:
+    """ The injector of the injection in progress, else the container's """
+
+    from wired_injector import Injector
+    from wired_injector.injector import _resolving
+
+    scope = _resolving.scope
+    if scope.cache is getattr(container, '_cache', False):
+        return scope.injector
+    return container.get(Injector)
+
+
+def _make(container: ServiceContainer, lookup_type: Type) -> Any:
+    """ Get from the container, injecting if it hands back a class """
+
+    service = container.get(lookup_type)
+    if isclass(service):
+        service = _active_injector(container)(service)
+    return service
+
+
+class LazyProxy:
+    """Stands in for a service until it is first used.
+
+    Attribute access, setting attributes and calling all resolve
+    the service, once, then pass through to it.
+    """
+
+    __slots__ = ('_resolve', '_service')
+
+    def __init__(self, resolve: Callable[[], Any]):
+        object.__setattr__(self, '_resolve', resolve)
+
+    def _get_service(self) -> Any:
+        try:
+            return object.__getattribute__(self, '_service')
+        except AttributeError:
+            service = self._resolve()
+            object.__setattr__(self, '_service', service)
+            return service
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_service(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._get_service(), name, value)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._get_service()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        try:
+            service = object.__getattribute__(self, '_service')
+        except AttributeError:
+            return '<LazyProxy unresolved>'
+        return f'<LazyProxy {service!r}>'
+
+
+@dataclass(frozen=True)
+class Lazy(Operator):
+    """Inject a proxy which gets the service on first use.
+
+    For an expensive dependency which only some code paths touch.
+    Looks up the field's type, or ``lookup_type`` if given.
+    """
+
+    lookup_type: Optional[Type] = None
+
+    def __call__(self, previous: Type, container: ServiceContainer):
+        lookup_type = self.lookup_type or previous
+        return LazyProxy(lambda: _make(container, lookup_type))
+
+
+@dataclass(frozen=True)
+class Provider(Operator):
+    """Inject a callable which gets the service each time it's called.
+
+    Classes the container hands back, e.g. ``use_props`` injectables,
+    are injected anew on each call. Services the container made with
+    a factory are cached by the container, as usual. Looks up the
+    field's type, or ``lookup_type`` if given.
+    """
+
+    lookup_type: Optional[Type] = None
+
+    def __call__(self, previous: Type, container: ServiceContainer):
+        lookup_type = self.lookup_type or previous
+
+        def provide() -> Any:
+            return _make(container, lookup_type)
+
+        return provide
+
+
+def _defined_by(cls: type, name: str) -> Optional[type]:
+    """ The class in ``cls.__mro__`` whose own body defines ``name`` """
+
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return klass
+    return None
+
+
+def _compiles_call(operator: Any, method: str) -> bool:
+    """Whether the operator's ``compile`` or ``getter`` can stand in
+    for calling it.
+
+    A subclass of ``Attr`` or ``Get`` which overrides ``__call__``
+    inherits a ``getter()`` or ``compile()`` doing what the parent's
+    ``__call__`` does, so the subclass is called instead.
+    """
+
+    cls = type(operator)
+    owner = _defined_by(cls, method)
+    if owner is None:
+        return False
+    call_owner = _defined_by(cls, '__call__')
+    return call_owner is None or issubclass(owner, call_owner)
+
+
+def _getter_step(getters: List[Getter]) -> Step:
+    """ One step applying a run of getters in turn """
+
+    if len(getters) == 1:
+        (getter,) = getters
+
+        def get_one(previous: Any, container: ServiceContainer) -> Any:
+            return getter(previous)
+
+        return get_one
+
+    all_getters = tuple(getters)
+
+    def get_all(previous: Any, container: ServiceContainer) -> Any:
+        for getter in all_getters:
+            previous = getter(previous)
+        return previous
+
+    return get_all
+
+
+def _steps(pipeline: Tuple[Operator, ...]) -> List[Step]:
+    """Each operator's step, folding runs of getters into one step.
+
+    Adjacent ``Attr`` become one dotted ``attrgetter``.
+    """
+
+    steps: List[Step] = []
+    getters: List[Getter] = []
+    names: List[str] = []
+    for operator in pipeline:
+        if type(operator) is Attr:
+            names.append(operator.name)
+            continue
+        if names:
+            getters.append(attrgetter('.'.join(names)))
+            names = []
+
+        getter = None
+        if _compiles_call(operator, 'getter'):
+            getter = operator.getter()
+        if getter is not None:
+            getters.append(getter)
+            continue
+        if getters:
+            steps.append(_getter_step(getters))
+            getters = []
+
+        # Operators which aren't ``Operator`` subclasses, or override
+        # ``__call__`` of a built-in, are still called as they are
+        if _compiles_call(operator, 'compile'):
+            steps.append(operator.compile())
+        else:
+            steps.append(operator)
+    if names:
+        getters.append(attrgetter('.'.join(names)))
+    if getters:
+        steps.append(_getter_step(getters))
+    return steps
+
+
+def compile_pipeline(
+    pipeline: Tuple[Operator, ...], start: Any
+) -> CompiledPipeline:
+    """Fuse a pipeline into one function of the container.
+
+    Done when a target's plan is made, rather than driving the
+    operators one by one on each injection.
+    """
+
+    steps = _steps(pipeline)
+    if len(steps) == 1:
+        (first,) = steps
+
+        def run_one(container: ServiceContainer) -> Any:
+            return first(start, container)
+
+        return run_one
+
+    if len(steps) == 2:
+        first, second = steps
+
+        def run_two(container: ServiceContainer) -> Any:
+            return second(first(start, container), container)
+
+        return run_two
+
+    all_steps = tuple(steps)
+
+    def run(container: ServiceContainer) -> Any:
+        result = start
+        for step in all_steps:
+            result = step(result, container)
+        return result
+
+    return run
+
+
+_cached_compile_pipeline = lru_cache(maxsize=1024)(compile_pipeline)
+
 
 def process_pipeline(
     container: ServiceContainer,
     pipeline: Tuple[Operator, ...],
     start: Any,
 ):
-    iter_pipeline = iter(pipeline)
-    result = start
-    while iter_pipeline:
-        try:
-            operator = next(iter_pipeline)
-            result = operator(result, container)
-        except StopIteration:
-            return result
+    """ Run a pipeline, compiling it the first time it is seen """
+
+    try:
+        run = _cached_compile_pipeline(pipeline, start)
+    except TypeError:
+        # An operator which can't be hashed
+        run = compile_pipeline(pipeline, start)
+    return run(container)
@@ -0,0 +1,156 @@
+"""
+Cache what the injector learns about a target.
+
+Injecting a target means ``get_type_hints``, ``dataclasses.fields``
+or ``inspect.signature``, then a ``FieldInfo`` per field. None of
+that changes between calls. Do it once, keep the result in a plan,
+and let later injections go straight to the container lookups.
+"""
+import threading
+from inspect import ismethod
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from wired_injector.compiler import compile_plan
+from wired_injector.field_info import (
+    FieldInfo,
+    clear_type_hints,
+    get_field_infos,
+)
+from wired_injector.rules import Rule, adapt_rule, plan_rule
+
+
+class FieldPlan(NamedTuple):
+    """ A field plus the rules which can fire for it """
+
+    field_info: FieldInfo
+    rules: Tuple[Rule, ...]
+
+
+class InjectionPlan(NamedTuple):
+    """ The per-field decisions needed to inject a target """
+
+    field_plans: Tuple[FieldPlan, ...]
+
+
+def plan_field(
+    field_info: FieldInfo, target: Any, rules: Tuple[Rule, ...]
+) -> FieldPlan:
+    """ Keep the call-time rules which can fire for this field """
+
+    field_rules = []
+    for rule in rules:
+        field_rule = plan_rule(rule, field_info, target)
+        if field_rule is not None:
+            field_rules.append(field_rule)
+    return FieldPlan(field_info=field_info, rules=tuple(field_rules))
+
+
+def make_plan(target: Any, rules: Tuple[Any, ...]) -> InjectionPlan:
+    """ Introspect a target and decide which rules apply to each field """
+
+    adapted = tuple(adapt_rule(rule) for rule in rules)
+    field_plans = tuple(
+        plan_field(field_info, target, adapted)
+        for field_info in get_field_infos(target)
+    )
+    return InjectionPlan(field_plans=field_plans)
+
+
+def _keys(target: Any, rules: Tuple[Any, ...]) -> Tuple[Any, Any]:
+    """The target's key in the cache, and its plan's key under that.
+
+    A bound method is a new object on each attribute access, so its
+    cache entry would die straight away. Key it on its function
+    instead. The plan leaves out the first argument, and is the same
+    whichever instance the method is bound to: the compiled function
+    is passed the bound method on each call.
+    """
+
+    if ismethod(target):
+        return target.__func__, ('bound method', rules)
+    return target, rules
+
+
+class PlanCache:
+    """Injection plans, weakly keyed on the target.
+
+    Classes made on the fly, for example in tests or plugins, can
+    still be garbage collected. Targets which can't be weakly
+    referenced are planned on every call instead of cached.
+
+    A registry's containers, possibly in many threads, share one
+    cache. Reading a plan takes no lock. Making one does, so each
+    plan is made once and every thread gets the same one.
+    """
+
+    def __init__(self) -> None:
+        self._plans: WeakKeyDictionary = WeakKeyDictionary()
+        self._compiled: WeakKeyDictionary = WeakKeyDictionary()
+        # Reentrant, a rule's plan hook might look up another plan
+        self._lock = threading.RLock()
+
+    def get(self, target: Any, rules: Tuple[Any, ...]) -> InjectionPlan:
+        """ Return the plan for this target and rules, making if needed """
+
+        key, rules_key = _keys(target, rules)
+        try:
+            return self._plans[key][rules_key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Can't make a weakref to this target
+            return make_plan(target, rules)
+
+        with self._lock:
+            plans: Dict[Tuple[Any, ...], InjectionPlan]
+            plans = self._plans.setdefault(key, {})
+            try:
+                return plans[rules_key]
+            except KeyError:
+                # Not made by another thread while we waited
+                plan = plans[rules_key] = make_plan(target, rules)
+                return plan
+
+    def get_compiled(
+        self, target: Any, rules: Tuple[Any, ...]
+    ) -> Optional[Callable[..., Any]]:
+        """ Return the generated injector function, if there can be one """
+
+        key, rules_key = _keys(target, rules)
+        try:
+            return self._compiled[key][rules_key]
+        except KeyError:
+            pass
+        except TypeError:
+            return None
+
+        with self._lock:
+            compiled = self._compiled.setdefault(key, {})
+            try:
+                return compiled[rules_key]
+            except KeyError:
+                plan = self.get(target, rules)
+                inject = compiled[rules_key] = compile_plan(target, plan)
+                return inject
+
+    def discard(self, target: Any) -> None:
+        """ Forget one target's plans, e.g. after reloading its module """
+
+        key = _keys(target, ())[0]
+        try:
+            with self._lock:
+                self._plans.pop(key, None)
+                self._compiled.pop(key, None)
+        except TypeError:
+            # Can't make a weakref to this target, so it wasn't cached
+            return
+        clear_type_hints(target)
+
+    def clear(self) -> None:
+        """ Forget all plans, for example after a code reload """
+
+        with self._lock:
+            self._plans.clear()
+            self._compiled.clear()
+        clear_type_hints()
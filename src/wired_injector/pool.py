@@ -0,0 +1,66 @@
+"""
+Reuse per-request containers.
+
+``InjectorRegistry.pool`` hands out ready injectable containers and
+takes them back after the request. Releasing a container drops the
+instances it made and anything registered on it during the request.
+The registry's registrations, including the ``Injector``, stay.
+"""
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Deque, Iterator, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from wired_injector.registry import InjectorContainer, InjectorRegistry
+
+
+class ContainerPool:
+    """Idle containers, up to ``maxsize`` of them.
+
+    ``acquire`` makes a container when none is idle and ``release``
+    lets it go when the pool is full, so the pool never blocks.
+    """
+
+    def __init__(self, registry: 'InjectorRegistry', maxsize: int = 64):
+        self.registry = registry
+        self.maxsize = maxsize
+        self._idle: Deque['InjectorContainer'] = deque()
+
+    def acquire(self, context: Optional[Any] = None) -> 'InjectorContainer':
+        """ An injectable container bound to ``context`` """
+
+        try:
+            container = self._idle.pop()
+        except IndexError:
+            return self.registry.create_injectable_container(context=context)
+        container.context = context
+        return container
+
+    def release(self, container: 'InjectorContainer') -> None:
+        """ Clear the container's instances and keep it for reuse """
+
+        if container._factories is not self.registry._factories:
+            raise ValueError('Container is not from this registry')
+
+        # The cache also holds the context's finalizer, which the old
+        # cache detaches when collected
+        container._cache = container._ServiceCache()
+        container.context = None
+        container.has_local_services = False
+        if len(self._idle) < self.maxsize:
+            self._idle.append(container)
+
+    @contextmanager
+    def container(
+        self, context: Optional[Any] = None
+    ) -> Iterator['InjectorContainer']:
+        """ Acquire a container for a ``with`` block, then release it """
+
+        container = self.acquire(context)
+        try:
+            yield container
+        finally:
+            self.release(container)
+
+    def __len__(self) -> int:
+        return len(self._idle)
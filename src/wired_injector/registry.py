@@ -1,24 +1,240 @@
+import threading
+import warnings
+from concurrent.futures import Executor
+from contextlib import contextmanager
 from importlib import import_module
 from types import ModuleType
-from typing import Optional, Union, Callable, Any, Mapping
+from typing import (
+    Optional,
+    Union,
+    Callable,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Set,
+    Dict,
+)
 
 from venusian import Scanner
 from wired import ServiceRegistry, ServiceContainer
+from wired.container import ServiceCache
 from wired_injector import Injector
+from wired_injector.injector import _resolving
+from wired_injector.async_injector import AsyncInjector
+from wired_injector.field_info import get_field_infos
+from wired_injector.freeze import (
+    FreezeError,
+    FreezeReport,
+    Injectable,
+    PipelineWarning,
+    check_injectable,
+    check_pipeline,
+    find_cycles,
+)
+from wired_injector.hooks import InjectionHook
+from wired_injector.memo import MemoCache
+from wired_injector.misses import MissCache
+from wired_injector.plan import PlanCache
+from wired_injector.pool import ContainerPool
 from wired_injector.utils import caller_package
-from zope.interface import Interface
+from zope.interface import Interface, providedBy
+from zope.interface.adapter import AdapterRegistry
 
 PACKAGE = Optional[Union[ModuleType, str]]
 
 
+class _LockedAdapterRegistry(AdapterRegistry):
+    """ Registers one service at a time, for slow fields' threads """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._register_lock = threading.Lock()
+
+    def register(self, *args, **kwargs) -> None:
+        with self._register_lock:
+            super().register(*args, **kwargs)
+
+
+class _LockedServiceCache(ServiceCache):
+    """ A container's instances, safe to add to from several threads """
+
+    _AdapterRegistry = _LockedAdapterRegistry
+
+    def __init__(self, default=None) -> None:
+        super().__init__(default)
+        self._get_lock = threading.Lock()
+
+    def get(self, *args, **kwargs):
+        # Two threads mustn't each make a context's registry
+        with self._get_lock:
+            return super().get(*args, **kwargs)
+
+
+# Guards each container's ``_flights``
+_flights_lock = threading.Lock()
+
+
 class InjectorContainer(ServiceContainer):
     """A service container that can inject with props.
 
     We need a separate ``inject`` method that can take keyword
     args and use as "props" during injection. These props then
     supersede other values used for a field.
+
+    The container's ``injector`` is what ``get(Injector)`` returns,
+    also from containers bound to another context, e.g. by wired when
+    getting a service registered for the None context.
+
+    Lookups which failed are kept in the registry's ``misses`` and fail
+    again without asking wired, unless the container has services of
+    its own, from ``set`` or ``register_factory``. During an injection,
+    lookups which succeeded are kept in the thread's resolution scope.
+
+    While slow fields resolve on worker threads, see ``parallel``, a
+    service is made by the first thread asking for it and the others
+    wait for it, so there's still one instance per service.
     """
 
+    _ServiceCache = _LockedServiceCache
+
+    injector: Injector
+    # The container this was bound from
+    root: Optional['InjectorContainer'] = None
+    misses: Optional[MissCache] = None
+    has_local_services = False
+    # A lock per service being looked up, while ``parallel`` is open
+    _flights: Optional[Dict[Any, threading.RLock]] = None
+    _parallel = 0
+
+    def bind(self, *, context) -> 'InjectorContainer':
+        container = super().bind(context=context)
+        if container is not self:
+            container.root = self.root or self
+            container.misses = self.misses
+        return container
+
+    def get(self, iface_or_type=Interface, **kwargs):
+        # In an injection, each service is asked of wired once
+        services = None
+        scope = _resolving.scope
+        if (
+            scope.cache is self._cache
+            and 'context' not in kwargs
+            and 'default' not in kwargs
+        ):
+            services = scope.services
+            scope_key = (
+                iface_or_type,
+                kwargs.get('name', ''),
+                id(self.context),
+            )
+            try:
+                return services[scope_key]
+            except KeyError:
+                pass
+            except TypeError:
+                # Unhashable
+                services = None
+
+        if (self.root or self)._parallel:
+            service = self._get_one_at_a_time(iface_or_type, kwargs)
+        else:
+            service = self._lookup(iface_or_type, kwargs)
+
+        if services is not None:
+            services[scope_key] = service
+        return service
+
+    def _lookup(self, iface_or_type, kwargs):
+        misses = self.misses
+        if (
+            misses is None
+            or (self.root or self).has_local_services
+            or 'context' in kwargs
+        ):
+            # Another context is looked up on a bound container
+            return super().get(iface_or_type, **kwargs)
+        return self._get_or_miss(misses, iface_or_type, kwargs)
+
+    def _get_one_at_a_time(self, iface_or_type, kwargs):
+        """ Wait for any other thread making this service, then look up """
+
+        root = self.root or self
+        context = kwargs.get('context', self.context)
+        key = (iface_or_type, id(context), kwargs.get('name', ''))
+        with _flights_lock:
+            flights = root._flights
+            try:
+                flight = None if flights is None else flights.get(key)
+            except TypeError:
+                # Unhashable
+                flights = None
+            if flights is not None and flight is None:
+                # Reentrant: a factory may look up, via another context,
+                # the same key on the same thread
+                flight = flights[key] = threading.RLock()
+        if flight is None:
+            return self._lookup(iface_or_type, kwargs)
+        with flight:
+            return self._lookup(iface_or_type, kwargs)
+
+    @contextmanager
+    def parallel(self) -> Iterator[None]:
+        """ Other threads are getting services from this container """
+
+        root = self.root or self
+        with _flights_lock:
+            if not root._parallel:
+                root._flights = {}
+            root._parallel += 1
+        try:
+            yield
+        finally:
+            with _flights_lock:
+                root._parallel -= 1
+                if not root._parallel:
+                    root._flights = None
+
+    def _get_or_miss(self, misses: MissCache, iface_or_type, kwargs):
+        key = (
+            iface_or_type,
+            providedBy(self.context),
+            kwargs.get('name', ''),
+        )
+        try:
+            error = misses.get(key)
+        except TypeError:
+            # Unhashable
+            return super().get(iface_or_type, **kwargs)
+        if error is not None:
+            if 'default' in kwargs:
+                return kwargs['default']
+            raise error('could not find registered service factory')
+
+        try:
+            return super().get(iface_or_type, **kwargs)
+        except (LookupError, TypeError, ValueError) as exc:
+            misses.add(key, exc)
+            raise
+
+    def set(self, *args, **kwargs):
+        # Bound containers share the root's cache of services
+        (self.root or self).has_local_services = True
+        self._forget_scope()
+        super().set(*args, **kwargs)
+
+    def register_factory(self, *args, **kwargs):
+        (self.root or self).has_local_services = True
+        self._forget_scope()
+        super().register_factory(*args, **kwargs)
+
+    def _forget_scope(self) -> None:
+        scope = _resolving.scope
+        if scope.cache is self._cache:
+            scope.services.clear()
+
     def inject(
         self,
         iface_or_type=Interface,
@@ -43,35 +259,186 @@ class InjectorContainer(ServiceContainer):
         result = injector(klass, system_props, **kwargs)
         return result
 
+    async def ainject(
+        self,
+        iface_or_type=Interface,
+        *,
+        context=None,
+        name='',
+        default=None,
+        system_props: Optional[Mapping[str, Any]] = None,
+        **kwargs,
+    ):
+        """ Same as ``inject`` but awaiting async factories and operators """
+
+        klass = self.get(
+            iface_or_type,
+            context=context,
+            name=name,
+            default=default,
+        )
+        injector = self.get(AsyncInjector)
+        return await injector.ainject(klass, system_props, **kwargs)
+
+    def inject_many(
+        self,
+        iface_or_type=Interface,
+        props_seq: Iterable[Mapping[str, Any]] = (),
+        *,
+        context=None,
+        name='',
+        default=None,
+        system_props: Optional[Mapping[str, Any]] = None,
+    ) -> List[Any]:
+        """ Like ``inject`` for a sequence of props, returning a list """
+
+        klass = self.get(
+            iface_or_type,
+            context=context,
+            name=name,
+            default=default,
+        )
+        injector = self.get(Injector)
+        return injector.inject_many(klass, props_seq, system_props)
+
+    def inject_iter(
+        self,
+        iface_or_type=Interface,
+        props_iterable: Iterable[Mapping[str, Any]] = (),
+        *,
+        context=None,
+        name='',
+        default=None,
+        system_props: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator[Any]:
+        """ Like ``inject_many`` but yield instances one at a time """
+
+        klass = self.get(
+            iface_or_type,
+            context=context,
+            name=name,
+            default=default,
+        )
+        injector = self.get(Injector)
+        return injector.inject_iter(klass, props_iterable, system_props)
+
+
+def _get_injector(container: InjectorContainer) -> Injector:
+    return (container.root or container).injector
+
+
+def _make_async_injector(container: InjectorContainer) -> AsyncInjector:
+    return AsyncInjector.from_injector(container.get(Injector))
+
 
 class InjectorRegistry(ServiceRegistry):
-    """ A registry with a venusian Scanner and injector"""
+    """A registry with a venusian Scanner and injector.
+
+    Pass an ``executor``, e.g. a bounded ``ThreadPoolExecutor``, to
+    have every container's injector resolve slow fields in parallel.
+    A ``hook`` is likewise given to every container's injector.
+
+    Containers share the registry's ``plans``, which ``freeze`` fills
+    for every injectable at startup, and its ``memo`` of instances of
+    injectables registered with ``memoize=True``. At most ``memo_size``
+    instances are kept, and registering a factory forgets them all, as
+    it does the ``misses``, lookups known to fail.
+    """
 
     scanner: Scanner
+    executor: Optional[Executor]
+    slow_types: Set[Any]
+    hook: Optional[InjectionHook]
+    injectables: List[Injectable]
+    plans: PlanCache
+    memo: MemoCache
+    misses: MissCache
+    pool: ContainerPool
 
-    def __init__(self, factory_registry=None):
+    def __init__(
+        self,
+        factory_registry=None,
+        executor: Optional[Executor] = None,
+        hook: Optional[InjectionHook] = None,
+        memo_size: int = 1024,
+        pool_size: int = 64,
+    ):
         super().__init__(factory_registry=factory_registry)
         self.scanner = Scanner(registry=self)
+        self.executor = executor
+        self.hook = hook
+        self.slow_types = set()
+        self.injectables = []
+        self.plans = PlanCache()
+        self.memo = MemoCache(memo_size)
+        self.misses = MissCache(self._factories)
+        self.pool = ContainerPool(self, pool_size)
+
+        # Registered once here rather than on each container. The
+        # Interface context means the factory is passed the container
+        # asked, not one bound to the None context.
+        self.register_factory(_get_injector, Injector, context=Interface)
+        self.register_factory(
+            _make_async_injector, AsyncInjector, context=Interface
+        )
 
     def scan(self, pkg: PACKAGE = None):
+        """Register the package's injectables.
+
+        A pipeline which can be seen to fail, e.g. an ``Attr`` its
+        ``Get`` type doesn't have, gives a ``PipelineWarning``.
+        """
+
         if pkg is None:
             # Get the caller module and import it
             pkg = caller_package()
         elif isinstance(pkg, str):
             # importlib.resource package specification
             pkg = import_module(pkg)
+        scanned = len(self.injectables)
         self.scanner.scan(pkg)
 
+        for injectable in self.injectables[scanned:]:
+            target = injectable.target
+            for field_info in get_field_infos(target):
+                for finding in check_pipeline(target, field_info):
+                    warnings.warn(str(finding), PipelineWarning, stacklevel=2)
+
     def create_container(self, *, context=None) -> InjectorContainer:
-        return InjectorContainer(self._factories, context=context)
+        container = InjectorContainer(self._factories, context=context)
+        container.misses = self.misses
+        container.injector = Injector(
+            container,
+            plans=self.plans,
+            executor=self.executor,
+            slow_types=self.slow_types,
+            hook=self.hook,
+            memo=self.memo,
+        )
+        return container
 
     def create_injectable_container(
         self, *, context=None
     ) -> InjectorContainer:
-        container = self.create_container(context=context)
-        injector = Injector(container)
-        container.register_singleton(injector, Injector)
-        return container
+        """A container whose ``Injector`` shares the registry's config.
+
+        Every container from this registry now has its injector, this
+        is kept for compatibility. See also ``pool``, which reuses
+        containers.
+        """
+
+        return self.create_container(context=context)
+
+    def register_factory(
+        self, factory, iface_or_type=Interface, *, context=None, name=''
+    ):
+        # Kept instances may have been built with what this replaces,
+        # and failed lookups may now succeed
+        self.memo.clear()
+        self.misses.clear()
+        super().register_factory(
+            factory, iface_or_type, context=context, name=name
+        )
 
     def register_injectable(
         self,
@@ -79,6 +446,9 @@ class InjectorRegistry(ServiceRegistry):
         target: Callable = None,
         context: Optional[Any] = None,
         use_props: bool = False,
+        slow: bool = False,
+        memoize: bool = False,
+        strict: bool = False,
     ):
         """Imperative form of the injectable decorator.
 
@@ -91,6 +461,11 @@ class InjectorRegistry(ServiceRegistry):
             target: A callable or class to register
             context: A container context
             use_props: This factory should be injected with keyword args
+            slow: Fields of this type are resolved on the executor
+            memoize: Reuse instances made with the same props and
+                context class
+            strict: Only look up fields marked ``Inject()``, having a
+                pipeline or wanting the container
         """
 
         def injectable_factory(container: ServiceContainer):
@@ -103,5 +478,54 @@ class InjectorRegistry(ServiceRegistry):
                 instance = injector(target)
                 return instance
 
+        if slow:
+            self.slow_types.add(for_)
+        if memoize:
+            self.memo.targets.add(target)
+        if strict:
+            target.__wired_strict__ = True  # type: ignore
+            self.plans.discard(target)
+        self.injectables.append(Injectable(for_, target, context, use_props))
+
         target.__wired_factory__ = injectable_factory  # type: ignore
         self.register_factory(target, for_, context=context)
+
+    def freeze(self, strict: bool = False) -> FreezeReport:
+        """Plan and check every injectable, e.g. at startup after a scan.
+
+        Each target's plan, and generated injector function, is made
+        now rather than on the first request, and kept for every
+        container. Required fields with no registered factory, pipelines
+        plucking attributes their ``Get`` type doesn't have, and cycles
+        between injectables are reported.
+
+        Args:
+            strict: Raise ``FreezeError`` rather than return a report
+                with problems
+        """
+
+        rules = Injector.rules
+        targets: Dict[Any, Any] = {}
+        for injectable in self.injectables:
+            targets.setdefault(injectable.for_, injectable.target)
+
+        findings = []
+        graph: Dict[Any, List[Any]] = {}
+        for injectable in self.injectables:
+            target = injectable.target
+            plan = self.plans.get(target, rules)
+            self.plans.get_compiled(target, rules)
+            target_findings, depends_on = check_injectable(
+                injectable, plan, self.find_factory, targets
+            )
+            findings.extend(target_findings)
+            graph.setdefault(target, []).extend(depends_on)
+
+        report = FreezeReport(
+            targets=tuple(graph),
+            findings=tuple(findings),
+            cycles=tuple(find_cycles(graph)),
+        )
+        if strict and not report.ok:
+            raise FreezeError(report)
+        return report
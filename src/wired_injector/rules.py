@@ -0,0 +1,425 @@
+"""
+Rules which decide, field by field, where a value comes from.
+
+The injector asks each rule in turn about a field. A rule can say
+to skip the field, can say it found the value, or can pass.
+
+A rule is a plain callable taking ``(field_info, props, container,
+system_props)``. It returns the value it found, ``SKIP``, or
+``NOT_FOUND`` to let the next rule have a go. Nothing is allocated
+or raised per field.
+
+In strict mode, ``field_make_pipeline`` is swapped for
+``strict_field_make_pipeline``, which only looks up fields marked
+with ``Inject()``, having a pipeline or wanting the container. A
+target registered with ``strict=True`` gets the same treatment from
+any injector.
+
+A rule can also have a plan-time phase: a ``plan`` attribute
+taking ``(field_info, target)``. It is called once, when the
+target's plan is made. Return ``None`` if the rule can never fire
+for that field, or the callable to use for it at call time: the
+rule itself or something specialized. ``with_plan`` attaches a
+``plan`` to a rule function.
+
+The original rules were ``NamedTuple`` classes which raised
+``SkipField`` or ``FoundValueField``. Those still work in
+``Injector.rules``, via ``adapt_rule``.
+"""
+import builtins
+import typing
+from inspect import getmodule, isclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from wired import ServiceContainer
+from wired_injector.field_info import FieldInfo
+from wired_injector.markers import Inject
+from wired_injector.operators import process_pipeline
+
+# (field_info, props, container, system_props) -> value, SKIP, NOT_FOUND
+Rule = Callable[..., Any]
+
+# (field_info, target) -> the call-time rule or None
+RulePlanner = Callable[[FieldInfo, Any], Optional[Rule]]
+
+
+class _Sentinel:
+    """ A unique value a rule returns to steer the injector """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f'<{self.name}>'
+
+
+SKIP = _Sentinel('SKIP')
+"""Leave this field out of construction, e.g. ``init=False``."""
+
+NOT_FOUND = _Sentinel('NOT_FOUND')
+"""This rule has no opinion, ask the next rule."""
+
+
+class SkipField(BaseException):
+    """Not part of construction.
+
+    Tell the injector that this field should not be part of
+    construction. Used for example on a dataclass field with
+    field(init=False).
+    """
+
+    pass
+
+
+class FoundValueField(BaseException):
+    """Found a value for the field.
+
+    If a rule matches a condition and finds a value, return
+    the value as the exception value, then put it in the
+    args for that field.
+    """
+
+    def __init__(self, *args):
+        self.value = args[0] if args else None
+
+
+class FieldIsInit(NamedTuple):
+    """ If this is a dataclass field with init=False, skip """
+
+    field_info: FieldInfo
+    props: Dict
+    container: ServiceContainer
+    system_props: Optional[Dict] = None
+
+    def __call__(self):
+        if self.field_info.init is False:
+            raise SkipField()
+
+
+class FieldIsInProps(NamedTuple):
+    """ If field in passed-in props or system props, return value """
+
+    field_info: FieldInfo
+    props: Dict
+    container: ServiceContainer
+    system_props: Optional[Dict] = None
+
+    def __call__(self):
+        if self.props and self.field_info.field_name in self.props:
+            # Props have precedence
+            prop_value = self.props[self.field_info.field_name]
+            raise FoundValueField(prop_value)
+        elif (
+            self.system_props
+            and self.field_info.field_name in self.system_props
+        ):
+            # If the "system" passes in props behind the scenes, use it
+            prop_value = self.system_props[self.field_info.field_name]
+            raise FoundValueField(prop_value)
+
+
+class FieldIsContainer(NamedTuple):
+    """ If the field is asking for a ServiceContainer, return it """
+
+    field_info: FieldInfo
+    props: Dict
+    container: ServiceContainer
+    system_props: Optional[Dict] = None
+
+    def __call__(self):
+        if self.field_info.field_type is ServiceContainer:
+            raise FoundValueField(self.container)
+
+
+class FieldMakePipeline(NamedTuple):
+    """ If pipeline, process it, else, bail out """
+
+    field_info: FieldInfo
+    props: Dict
+    container: ServiceContainer
+    system_props: Optional[Dict] = None
+
+    def __call__(self):
+        fi = self.field_info
+        c = self.container
+        if not fi.pipeline:
+            if getmodule(fi.field_type) is typing:
+                # Test this because, when you have a field like:
+                #   names: Tuple[str, ...] = ('Name 1',)
+                # ...then wired tries to do obj.__qualname__ and fails
+                raise SkipField()
+            try:
+                fv = c.get(fi.field_type)
+            except (TypeError, LookupError):
+                # We're probably looking up something like str. Since
+                # we might have a default value, let's skip this.
+                raise SkipField()
+        else:
+            fv = process_pipeline(c, fi.pipeline, fi.field_type)
+        raise FoundValueField(fv)
+
+
+def with_plan(planner: RulePlanner) -> Callable[[Rule], Rule]:
+    """ Decorate a rule function with its plan-time phase """
+
+    def decorator(rule: Rule) -> Rule:
+        rule.plan = planner  # type: ignore
+        return rule
+
+    return decorator
+
+
+def plan_rule(
+    rule: Rule, field_info: FieldInfo, target: Any
+) -> Optional[Rule]:
+    """ Run a rule's plan-time phase, if it has one """
+
+    planner = getattr(rule, 'plan', None)
+    if planner is None:
+        return rule
+    return planner(field_info, target)
+
+
+def always_skip(
+    field_info: FieldInfo,
+    props: Mapping[str, Any],
+    container: ServiceContainer,
+    system_props: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """ Call-time rule for a field the plan knows to skip """
+
+    return SKIP
+
+
+def use_container(
+    field_info: FieldInfo,
+    props: Mapping[str, Any],
+    container: ServiceContainer,
+    system_props: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """ Call-time rule for a field the plan knows wants the container """
+
+    return container
+
+
+def _plan_field_is_init(
+    field_info: FieldInfo, target: Any
+) -> Optional[Rule]:
+    return always_skip if field_info.init is False else None
+
+
+@with_plan(_plan_field_is_init)
+def field_is_init(
+    field_info: FieldInfo,
+    props: Mapping[str, Any],
+    container: ServiceContainer,
+    system_props: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """ If this is a dataclass field with init=False, skip """
+
+    if field_info.init is False:
+        return SKIP
+    return NOT_FOUND
+
+
+def field_is_in_props(
+    field_info: FieldInfo,
+    props: Mapping[str, Any],
+    container: ServiceContainer,
+    system_props: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """ If field in passed-in props or system props, return value """
+
+    field_name = field_info.field_name
+    if props and field_name in props:
+        # Props have precedence
+        return props[field_name]
+    if system_props and field_name in system_props:
+        # If the "system" passes in props behind the scenes, use it
+        return system_props[field_name]
+    return NOT_FOUND
+
+
+def _plan_field_is_container(
+    field_info: FieldInfo, target: Any
+) -> Optional[Rule]:
+    if field_info.field_type is ServiceContainer:
+        return use_container
+    return None
+
+
+@with_plan(_plan_field_is_container)
+def field_is_container(
+    field_info: FieldInfo,
+    props: Mapping[str, Any],
+    container: ServiceContainer,
+    system_props: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """ If the field is asking for a ServiceContainer, return it """
+
+    if field_info.field_type is ServiceContainer:
+        return container
+    return NOT_FOUND
+
+
+def is_strict(target: Any) -> bool:
+    """ Was the target registered with ``strict=True`` """
+
+    # Not inherited, a subclass is registered in its own right
+    return getattr(target, '__dict__', {}).get('__wired_strict__', False)
+
+
+def is_injected(field_info: FieldInfo) -> bool:
+    """ In strict mode, does this field get looked up """
+
+    if field_info.pipeline:
+        return True
+    if any(isinstance(marker, Inject) for marker in field_info.markers):
+        return True
+    field_type = field_info.field_type
+    return isclass(field_type) and issubclass(field_type, ServiceContainer)
+
+
+def has_local_default(field_info: FieldInfo) -> bool:
+    """A default the container couldn't have a service for.
+
+    A dataclass ``default_factory``, or a default for a built-in type
+    such as ``str`` or a type left as a string, neither of which wired
+    can look up. Other defaults, e.g. ``Optional[Service] = None``, are
+    used when the lookup fails.
+    """
+
+    if field_info.default_factory is not None:
+        return True
+    field_type = field_info.field_type
+    return field_info.has_default and (
+        isinstance(field_type, str) or getmodule(field_type) is builtins
+    )
+
+
+def _plan_field_make_pipeline(
+    field_info: FieldInfo, target: Any
+) -> Optional[Rule]:
+    if not is_injected(field_info) and (
+        is_strict(target) or has_local_default(field_info)
+    ):
+        # Props, else the target's default
+        return always_skip
+    if not field_info.pipeline and getmodule(field_info.field_type) is typing:
+        return always_skip
+    return field_make_pipeline
+
+
+@with_plan(_plan_field_make_pipeline)
+def field_make_pipeline(
+    field_info: FieldInfo,
+    props: Mapping[str, Any],
+    container: ServiceContainer,
+    system_props: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """ If pipeline, process it, else, try the container for the type """
+
+    if not field_info.pipeline:
+        if getmodule(field_info.field_type) is typing:
+            # A field like ``names: Tuple[str, ...]`` makes wired
+            # fail on ``__qualname__``
+            return SKIP
+        try:
+            return container.get(field_info.field_type)
+        except (TypeError, LookupError):
+            # We're probably looking up something like str. Since
+            # we might have a default value, let's skip this.
+            return SKIP
+
+    try:
+        return process_pipeline(
+            container, field_info.pipeline, field_info.field_type
+        )
+    except SkipField:
+        # An operator, such as Get, couldn't find its value
+        return SKIP
+    except FoundValueField as exc:
+        return exc.value
+
+
+def _plan_strict_field_make_pipeline(
+    field_info: FieldInfo, target: Any
+) -> Optional[Rule]:
+    if not is_injected(field_info):
+        return always_skip
+    return _plan_field_make_pipeline(field_info, target)
+
+
+@with_plan(_plan_strict_field_make_pipeline)
+def strict_field_make_pipeline(
+    field_info: FieldInfo,
+    props: Mapping[str, Any],
+    container: ServiceContainer,
+    system_props: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """ ``field_make_pipeline`` for marked fields, skip the others """
+
+    if not is_injected(field_info):
+        return SKIP
+    return field_make_pipeline(field_info, props, container, system_props)
+
+
+def strict_rules(rules: Tuple[Rule, ...]) -> Tuple[Rule, ...]:
+    """ The rules with ``field_make_pipeline`` made strict """
+
+    return tuple(
+        strict_field_make_pipeline
+        if adapt_rule(rule) is field_make_pipeline
+        else rule
+        for rule in rules
+    )
+
+
+_BUILTIN_RULES: Dict[Any, Rule] = {
+    FieldIsInit: field_is_init,
+    FieldIsInProps: field_is_in_props,
+    FieldIsContainer: field_is_container,
+    FieldMakePipeline: field_make_pipeline,
+}
+
+
+def adapt_rule(rule: Any) -> Rule:
+    """Make a rule written in the older, class-based style callable.
+
+    The built-in rule classes map to their function equivalent.
+    Other classes are constructed and called per field, with their
+    ``SkipField`` and ``FoundValueField`` turned into return values.
+    """
+
+    if not isclass(rule):
+        return rule
+
+    builtin = _BUILTIN_RULES.get(rule)
+    if builtin is not None:
+        return builtin
+    rule_class: Any = rule
+
+    def legacy_rule(
+        field_info: FieldInfo,
+        props: Mapping[str, Any],
+        container: ServiceContainer,
+        system_props: Optional[Mapping[str, Any]] = None,
+    ) -> Any:
+        try:
+            rule_class(field_info, props, container, system_props)()
+        except SkipField:
+            return SKIP
+        except FoundValueField as exc:
+            return exc.value
+        return NOT_FOUND
+
+    legacy_rule.__wrapped__ = rule  # type: ignore
+    return legacy_rule
@@ -1,13 +1,16 @@
 import os
 import sys
+from typing import Any, Callable, Dict
 
 import pytest
 from wired import ServiceContainer
 from wired_injector import Injector, InjectorRegistry
+from wired_injector.hooks import HookCollector
 
 from examples.factories import (
     Customer,
     FrenchCustomer,
+    Settings,
 )
 from examples import factories
 
@@ -38,14 +41,39 @@ def french_container() -> ServiceContainer:
 
 
 @pytest.fixture
-def regular_injector(regular_container):
+def settings_registry() -> InjectorRegistry:
+    this_registry = InjectorRegistry()
+    this_registry.register_singleton(Settings(), Settings)
+    return this_registry
+
+
+MODES: Dict[str, Callable[[], Dict[str, Any]]] = dict(
+    compiled=lambda: dict(compiled=True),
+    interpreted=lambda: dict(compiled=False),
+    iterative=lambda: dict(iterative=True),
+    hooked=lambda: dict(hook=HookCollector()),
+)
+
+
+@pytest.fixture(params=list(MODES))
+def injector_mode(request) -> Dict[str, Any]:
+    """ Injector attributes for each way of injecting, made per test """
+    return MODES[request.param]()
+
+
+@pytest.fixture
+def regular_injector(injector_mode, regular_container):
     i: Injector = regular_container.get(Injector)
+    for name, value in injector_mode.items():
+        setattr(i, name, value)
     return i
 
 
 @pytest.fixture
-def french_injector(french_container):
+def french_injector(injector_mode, french_container):
     i: Injector = french_container.get(Injector)
+    for name, value in injector_mode.items():
+        setattr(i, name, value)
     return i
 
 
@@ -6,6 +6,7 @@ from dataclasses import dataclass, field, fields
 from typing import Optional, List
 
 from wired_injector.field_info import FieldInfo, dataclass_field_info_factory
+from wired_injector.markers import Slow
 from wired_injector.operators import Get
 
 
@@ -100,3 +101,30 @@ def test_optional():
     assert field_infos[0].field_type is Customer
     assert field_infos[0].default_value is None
     assert field_infos[0].pipeline == (Get(FrenchCustomer),)
+
+
+def test_markers():
+    @dataclass
+    class View:
+        customer_name: Annotated[Customer, Slow(), Get(FrenchCustomer)]
+
+    field_infos = _get_field_infos(View)
+    assert field_infos[0].field_type is Customer
+    assert field_infos[0].pipeline == (Get(FrenchCustomer),)
+    assert field_infos[0].markers == (Slow(),)
+
+
+def test_defaults():
+    @dataclass
+    class View:
+        customer_name: str
+        title: Optional[str] = None
+        names: List[str] = field(default_factory=list)
+
+    name_info, title_info, names_info = _get_field_infos(View)
+    assert name_info.has_default is False
+    assert name_info.default_factory is None
+    assert title_info.has_default is True
+    assert title_info.default_value is None
+    assert names_info.has_default is False
+    assert names_info.default_factory is list
@@ -66,6 +66,17 @@ def test_default_value():
     assert field_infos[0].field_name == 'customer_name'
     assert field_infos[0].field_type == str
     assert field_infos[0].default_value == 'Some Customer'
+    assert field_infos[0].has_default is True
+
+
+def test_default_none():
+    def target(customer_name: str, title: Optional[str] = None):
+        return 99
+
+    name_info, title_info = _get_field_infos(target)
+    assert name_info.has_default is False
+    assert title_info.has_default is True
+    assert title_info.default_value is None
 
 
 def test_annotation():
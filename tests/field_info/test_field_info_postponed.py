@@ -0,0 +1,141 @@
+"""
+Test FieldInfo when annotations are strings.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal as _Decimal
+from typing import TYPE_CHECKING, ClassVar, NamedTuple, Optional
+
+from wired import ServiceContainer
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.field_info import (
+    _type_hints,
+    clear_type_hints,
+    get_cached_type_hints,
+    get_field_infos,
+)
+from wired_injector.operators import Get
+from wired_injector.plan import PlanCache
+
+from examples.factories import Customer, View
+
+if TYPE_CHECKING:  # pragma: no cover
+    from decimal import Decimal
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+@dataclass
+class DataclassTarget:
+    kind: ClassVar[str] = 'dataclass'
+    container: ServiceContainer
+    view: View
+    customer_name: Annotated[str, Get(Customer, attr='name')]
+    count: int = field(init=False, default=0)
+
+
+def function_target(
+    container: ServiceContainer,
+    view: View,
+    customer_name: Annotated[str, Get(Customer, attr='name')],
+):
+    return view, customer_name
+
+
+class NamedTupleTarget(NamedTuple):
+    container: ServiceContainer
+    view: View
+    customer_name: Annotated[str, Get(Customer, attr='name')]
+
+
+@dataclass
+class PartlyTyped:
+    view: View
+    price: Optional[Decimal] = None
+
+
+class PlainTarget:
+    def __init__(
+        self,
+        container: ServiceContainer,
+        view: View,
+        customer_name: Annotated[str, Get(Customer, attr='name')],
+    ):
+        self.view = view
+        self.customer_name = customer_name
+
+
+def test_field_types():
+    for target in (
+        DataclassTarget,
+        function_target,
+        NamedTupleTarget,
+        PlainTarget,
+    ):
+        field_infos = get_field_infos(target)
+        assert [fi.field_type for fi in field_infos[:3]] == [
+            ServiceContainer,
+            View,
+            str,
+        ]
+        assert field_infos[2].pipeline == (Get(Customer, attr='name'),)
+
+
+def test_inject():
+    registry = InjectorRegistry()
+    registry.register_factory(View.__wired_factory__, View)
+    registry.register_singleton(Customer(), Customer)
+    container = registry.create_injectable_container()
+    injector = container.get(Injector)
+    assert injector(DataclassTarget).customer_name == 'Customer'
+    assert injector(function_target)[1] == 'Customer'
+    assert injector(NamedTupleTarget).view.name == 'View'
+    assert injector(PlainTarget).view.name == 'View'
+
+
+def test_cache():
+    clear_type_hints()
+    hints = get_cached_type_hints(DataclassTarget)
+    assert hints['view'] is View
+    assert get_cached_type_hints(DataclassTarget) is hints
+
+    clear_type_hints(DataclassTarget)
+    assert DataclassTarget not in _type_hints
+    assert get_cached_type_hints(DataclassTarget) == hints
+
+    plans = PlanCache()
+    plans.get(DataclassTarget, Injector.rules)
+    plans.discard(DataclassTarget)
+    assert DataclassTarget not in plans._plans
+    assert DataclassTarget not in _type_hints
+
+
+def test_unresolvable():
+    def target(view: Unknown):  # type: ignore # noqa: F821
+        return view
+
+    assert get_cached_type_hints(target) == {'view': 'Unknown'}
+    assert get_field_infos(target)[0].field_type == 'Unknown'
+
+
+def test_unresolvable_field(monkeypatch):
+    # Only the field whose type isn't in the module keeps its string
+    hints = get_cached_type_hints(PartlyTyped)
+    assert hints['view'] is View
+    assert hints['price'] == 'Optional[Decimal]'
+    assert PartlyTyped not in _type_hints
+
+    registry = InjectorRegistry()
+    registry.register_factory(View.__wired_factory__, View)
+    injector = registry.create_injectable_container().get(Injector)
+    assert injector(PartlyTyped).view.name == 'View'
+
+    # Not kept, so a name the module gets later is seen
+    monkeypatch.setitem(globals(), 'Decimal', _Decimal)
+    price = get_cached_type_hints(PartlyTyped)['price']
+    assert price == Optional[_Decimal]
+    assert PartlyTyped in _type_hints
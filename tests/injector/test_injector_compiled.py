@@ -0,0 +1,137 @@
+import gc
+import linecache
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+import pytest
+from wired import ServiceContainer
+from wired_injector.compiler import compile_plan
+from wired_injector.field_info import FieldInfo
+from wired_injector.injector import FoundValueField, Injector
+from wired_injector.operators import Attr, Get
+from wired_injector.plan import PlanCache, make_plan
+
+from examples.factories import View
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+@pytest.fixture
+def plain_injector(regular_container) -> Injector:
+    """ Not in iterative or hooked mode, which come before compiled """
+    return regular_container.get(Injector)
+
+
+def both_ways(injector: Injector, target, **kwargs):
+    """ Inject with the generated function then the rules loop """
+
+    injector.compiled = True
+    compiled = injector(target, **kwargs)
+    injector.compiled = False
+    interpreted = injector(target, **kwargs)
+    return compiled, interpreted
+
+
+def test_compile_dataclass():
+    @dataclass
+    class Target:
+        container: ServiceContainer
+        view: View
+        name: Annotated[str, Get(View), Attr('name')] = 'Default'
+
+    inject = compile_plan(Target, make_plan(Target, Injector.rules))
+    assert inject is not None
+    source = inject.__wired_source__  # type: ignore
+    assert 'return target(v0, v1, ' in source
+
+
+def test_compiled_source_forgotten():
+    plans = PlanCache()
+
+    @dataclass
+    class Target:
+        view: View
+
+    inject = plans.get_compiled(Target, Injector.rules)
+    filename = inject.__code__.co_filename  # type: ignore
+    assert filename in linecache.cache
+    del Target, inject
+    gc.collect()
+    assert len(plans._compiled) == 0
+    assert filename not in linecache.cache
+
+
+def test_compile_not_possible():
+    def target(*args):
+        return args
+
+    assert compile_plan(target, make_plan(target, Injector.rules)) is None
+
+
+def test_compiled_matches_interpreted(plain_injector):
+    @dataclass
+    class Target:
+        container: ServiceContainer
+        view: View
+        name: Annotated[str, Get(View), Attr('name')] = 'Default'
+        title: str = 'Title'
+        count: int = field(init=False, default=0)
+
+    compiled, interpreted = both_ways(plain_injector, Target, title='T')
+    assert compiled == interpreted
+    assert compiled.title == 'T'
+    assert compiled.name == 'View'
+
+
+def test_compiled_namedtuple(plain_injector):
+    class Target(NamedTuple):
+        view: View
+        name: str = 'Default'
+
+    compiled, interpreted = both_ways(plain_injector, Target)
+    assert compiled == interpreted
+
+
+def test_compiled_keyword_only(plain_injector):
+    def target(view: View, *, name: str = 'Default'):
+        return view.name, name
+
+    compiled, interpreted = both_ways(plain_injector, target, name='N')
+    assert compiled == interpreted == ('View', 'N')
+
+
+def test_compiled_missing_required(plain_injector):
+    def target(name: str):
+        return name  # pragma: no cover
+
+    plain_injector.compiled = True
+    with pytest.raises(TypeError) as compiled:
+        plain_injector(target)
+    plain_injector.compiled = False
+    with pytest.raises(TypeError) as interpreted:
+        plain_injector(target)
+    assert str(compiled.value) == str(interpreted.value)
+
+
+def test_compiled_custom_rule(regular_container):
+    class FieldIsFortyTwo(NamedTuple):
+        field_info: FieldInfo
+        props: dict
+        container: ServiceContainer
+        system_props: dict = None  # type: ignore
+
+        def __call__(self):
+            if self.field_info.field_name == 'answer':
+                raise FoundValueField(42)
+
+    rules = (FieldIsFortyTwo,) + Injector.rules
+    injector = Injector(regular_container, rules=rules)
+
+    def target(answer: int, view: View):
+        return answer, view.name
+
+    compiled, interpreted = both_ways(injector, target)
+    assert compiled == interpreted == (42, 'View')
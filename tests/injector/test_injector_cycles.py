@@ -0,0 +1,124 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Tuple
+
+import pytest
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.async_injector import AsyncInjector
+from wired_injector.injector import CycleError
+from wired_injector.operators import Get
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+class LeftService:
+    pass
+
+
+class RightService:
+    pass
+
+
+@dataclass
+class Left:
+    right: RightService
+
+
+@dataclass
+class Right:
+    left_name: Annotated[str, Get(LeftService, attr='name')]
+
+
+@dataclass
+class Top:
+    left: LeftService
+
+
+@dataclass
+class Ok:
+    name: str = 'Ok'
+
+
+def make_registry(use_props: bool = False) -> InjectorRegistry:
+    registry = InjectorRegistry()
+    registry.register_injectable(Top, Top, use_props=use_props)
+    registry.register_injectable(LeftService, Left, use_props=use_props)
+    registry.register_injectable(RightService, Right, use_props=use_props)
+    registry.register_injectable(Ok, Ok, use_props=use_props)
+    return registry
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_cycle(compiled):
+    container = make_registry().create_injectable_container()
+    container.get(Injector).compiled = compiled
+    with pytest.raises(CycleError) as exc:
+        container.get(Top)
+    assert exc.value.chain == (Left, Right, Left)
+    assert str(exc.value) == 'Dependency cycle: Left -> Right -> Left'
+    assert isinstance(exc.value, RecursionError)
+
+    # Nothing left over from the failed injection
+    assert container.get(Ok).name == 'Ok'
+
+
+def test_cycle_self():
+    @dataclass
+    class Node:
+        name: str = 'Node'
+
+    @dataclass
+    class Wrapper:
+        node: Node
+
+    registry = InjectorRegistry()
+    registry.register_injectable(Node, Wrapper)
+    container = registry.create_injectable_container()
+    with pytest.raises(CycleError) as exc:
+        container.get(Node)
+    assert exc.value.chain == (Wrapper, Wrapper)
+
+
+def test_cycle_async():
+    container = make_registry(use_props=True).create_injectable_container()
+    injector = AsyncInjector(container)
+
+    with pytest.raises(CycleError) as exc:
+        asyncio.run(injector.ainject(Top))
+    assert exc.value.chain == (Left, Right, Left)
+    assert asyncio.run(injector.ainject(Ok)).name == 'Ok'
+
+
+@dataclass
+class Tree:
+    """ Builds children of its own type after its fields """
+
+    injector: Injector
+    names: Tuple[str, ...] = ()
+    name: str = 'root'
+
+    def __post_init__(self):
+        self.children = [
+            self.injector(Tree, name=name) for name in self.names
+        ]
+
+
+def test_recursive_component(regular_injector):
+    # Not a cycle, Tree's fields don't need a Tree
+    tree = regular_injector(Tree, names=('a', 'b'))
+    assert [child.name for child in tree.children] == ['a', 'b']
+    assert tree.children[0].children == []
+
+
+async def async_tree(injector: AsyncInjector, names: Tuple[str, ...] = ()):
+    return [await injector.ainject(async_tree) for _ in names]
+
+
+def test_recursive_component_async():
+    container = make_registry().create_injectable_container()
+    injector = container.get(AsyncInjector)
+    tree = asyncio.run(injector.ainject(async_tree, names=('a', 'b')))
+    assert tree == [[], []]
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
 
 from wired import ServiceContainer
-from wired_injector.operators import Get, Attr, Context
+from wired_injector.markers import Inject
+from wired_injector.operators import AsDict, Attr, Call, Context, Get, Key
 
 from examples.factories import (
     View,
@@ -255,3 +256,73 @@ def test_context_then_attr(regular_injector):
     target: Target = regular_injector(Target)
     result = target()
     assert result == 'Customer'
+
+
+def test_local_defaults(regular_injector):
+    @dataclass
+    class Target:
+        view: Optional[View] = None
+        names: List[str] = field(default_factory=list)
+        made: View = field(default_factory=lambda: View('Made'))
+        marked: Annotated[View, Inject()] = field(
+            default_factory=lambda: View('Made')
+        )
+
+    target: Target = regular_injector(Target)
+    # Injected if registered
+    assert target.view is not None
+    assert target.view.name == 'View'
+    assert target.names == []
+    assert target.names is not regular_injector(Target).names
+    assert target.made.name == 'Made'
+    assert target.marked.name == 'View'
+
+
+def test_fast_operators(regular_injector):
+    """ Pipeline: Get, AsDict, Key, Call and a dotted Attr """
+
+    @dataclass
+    class Target:
+        view_name: Annotated[
+            str,
+            Get(View),
+            AsDict(),
+            Key('name'),
+            Call('upper'),
+        ]
+        customer_upper: Annotated[
+            Callable[[], str], Context(), Attr('name.upper')
+        ]
+
+    target: Target = regular_injector(Target)
+    assert target.view_name == 'VIEW'
+    assert target.customer_upper() == 'CUSTOMER'
+
+
+def test_subclassed_operators(regular_injector):
+    """ Pipeline: Get and Attr subclasses with their own __call__ """
+
+    @dataclass(frozen=True)
+    class GetOrNone(Get):
+        def __call__(self, previous, container):
+            try:
+                return container.get(self.lookup_type)
+            except LookupError:
+                return None
+
+    @dataclass(frozen=True)
+    class SafeAttr(Attr):
+        def __call__(self, previous, container):
+            return getattr(previous, self.name, 'fallback')
+
+    class Unregistered:
+        pass
+
+    @dataclass
+    class Target:
+        missing: Annotated[Optional[Unregistered], GetOrNone(Unregistered)]
+        view_name: Annotated[str, Get(View), SafeAttr('nmae')]
+
+    target: Target = regular_injector(Target)
+    assert target.missing is None
+    assert target.view_name == 'fallback'
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple, Optional
 
 import pytest
 from wired import ServiceContainer
@@ -11,6 +11,15 @@ from wired_injector.injector import (
     FieldIsContainer,
     FieldMakePipeline,
 )
+from wired_injector.rules import (
+    NOT_FOUND,
+    SKIP,
+    adapt_rule,
+    field_is_container,
+    field_is_in_props,
+    field_is_init,
+    field_make_pipeline,
+)
 from wired_injector.operators import Get
 
 from examples.factories import View
@@ -160,3 +169,72 @@ def test_is_pipeline_no_pipeline_lookup_error(regular_container):
     field_make_pipeline = FieldMakePipeline(fi, {}, regular_container)
     with pytest.raises(SkipField):
         field_make_pipeline()
+
+
+def test_field_is_init(regular_container):
+    fi = FieldInfo('foo', str, None, False, ())
+    assert SKIP is field_is_init(fi, {}, regular_container)
+    fi = FieldInfo('foo', str, None, True, ())
+    assert NOT_FOUND is field_is_init(fi, {}, regular_container)
+
+
+def test_field_is_in_props(regular_container):
+    fi = FieldInfo('foo', str, None, True, ())
+    assert NOT_FOUND is field_is_in_props(fi, {}, regular_container)
+    assert 1111 == field_is_in_props(
+        fi, dict(foo=1111), regular_container, dict(foo=9999)
+    )
+    assert 9999 == field_is_in_props(
+        fi, {}, regular_container, dict(foo=9999)
+    )
+
+
+def test_field_is_container(regular_container):
+    fi = FieldInfo('foo', str, None, True, ())
+    assert NOT_FOUND is field_is_container(fi, {}, regular_container)
+    fi = FieldInfo('foo', ServiceContainer, None, True, ())
+    result = field_is_container(fi, {}, regular_container)
+    assert result is regular_container
+
+
+def test_field_make_pipeline(regular_container):
+    class Bar:
+        pass
+
+    fi = FieldInfo('foo', View, None, True, ())
+    assert 'View' == field_make_pipeline(fi, {}, regular_container).name
+    fi = FieldInfo('foo', str, None, True, (Get(View),))
+    assert 'View' == field_make_pipeline(fi, {}, regular_container).name
+    fi = FieldInfo('foo', str, None, True, ())
+    assert SKIP is field_make_pipeline(fi, {}, regular_container)
+    fi = FieldInfo('foo', Bar, None, True, ())
+    assert SKIP is field_make_pipeline(fi, {}, regular_container)
+    fi = FieldInfo('foo', str, None, True, (Get(Bar),))
+    assert SKIP is field_make_pipeline(fi, {}, regular_container)
+
+
+def test_adapt_rule_builtin():
+    assert adapt_rule(FieldIsInProps) is field_is_in_props
+    assert adapt_rule(field_is_in_props) is field_is_in_props
+
+
+def test_adapt_rule_legacy(regular_container):
+    class FieldIsFoo(NamedTuple):
+        field_info: FieldInfo
+        props: Dict
+        container: ServiceContainer
+        system_props: Optional[Dict] = None
+
+        def __call__(self):
+            if self.field_info.field_name == 'foo':
+                raise FoundValueField(42)
+            if self.field_info.field_name == 'skipped':
+                raise SkipField()
+
+    rule = adapt_rule(FieldIsFoo)
+    fi = FieldInfo('foo', str, None, True, ())
+    assert 42 == rule(fi, {}, regular_container)
+    fi = FieldInfo('skipped', str, None, True, ())
+    assert SKIP is rule(fi, {}, regular_container)
+    fi = FieldInfo('bar', str, None, True, ())
+    assert NOT_FOUND is rule(fi, {}, regular_container)
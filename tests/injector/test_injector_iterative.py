@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import pytest
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.injector import CycleError, _resolving
+from wired_injector.operators import Get
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+built: List[str] = []
+
+
+@dataclass
+class Settings:
+    site_name: str = 'My Site'
+
+    def __post_init__(self):
+        built.append('Settings')
+
+
+@dataclass
+class Header:
+    settings: Settings
+
+
+@dataclass
+class Sidebar:
+    settings: Settings
+
+
+@dataclass
+class Page:
+    header: Header
+    sidebar: Sidebar
+    site_name: Annotated[str, Get(Settings, attr='site_name')]
+
+
+def make_injector(*targets, **kwargs) -> Injector:
+    # use_props makes the container return the class, to be injected
+    registry = InjectorRegistry()
+    for target in targets:
+        registry.register_injectable(target, target, use_props=True)
+    container = registry.create_injectable_container()
+    injector = container.get(Injector)
+    for name, value in kwargs.items():
+        setattr(injector, name, value)
+    return injector
+
+
+@pytest.mark.parametrize(
+    'iterative, expected', [(True, 1), (False, 3)], ids=['iterative', 'not']
+)
+def test_shared_node(iterative, expected):
+    injector = make_injector(Settings, Header, Sidebar, iterative=iterative)
+    built.clear()
+    page = injector(Page)
+    assert page.site_name == 'My Site'
+    assert len(built) == expected
+    assert (page.header.settings is page.sidebar.settings) is iterative
+
+    # Once per call, not once per container
+    injector(Page)
+    assert len(built) == expected * 2
+
+
+def test_deep_graph():
+    levels: List[type] = []
+    for i in range(500):
+        annotations: Dict[str, Any] = {}
+        if levels:
+            annotations['previous'] = levels[-1]
+        level = type(f'Level{i}', (), {'__annotations__': annotations})
+        levels.append(dataclass(level))
+
+    injector = make_injector(*levels, iterative=True)
+    top = injector(levels[-1])
+    for i in range(499):
+        top = top.previous
+    assert type(top) is levels[0]
+
+    injector.iterative = False
+    with pytest.raises(RecursionError):
+        injector(levels[-1])
+
+
+class LeftService:
+    pass
+
+
+@dataclass
+class Right:
+    left: LeftService
+
+
+@dataclass
+class Left:
+    right: Right
+
+
+def test_cycle():
+    registry = InjectorRegistry()
+    registry.register_injectable(LeftService, Left, use_props=True)
+    registry.register_injectable(Right, Right, use_props=True)
+    injector = registry.create_injectable_container().get(Injector)
+    injector.iterative = True
+    with pytest.raises(CycleError) as exc:
+        injector(Right)
+    assert exc.value.chain == (Right, Left, Right)
+    assert _resolving.targets == []
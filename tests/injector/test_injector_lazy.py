@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from typing import Callable, List
+
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.operators import Attr, Lazy, Provider, LazyProxy
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+made: List[str] = []
+
+
+class Search:
+    def __init__(self):
+        made.append('Search')
+
+    def query(self, text: str) -> str:
+        return f'Found {text}'
+
+
+@dataclass
+class Row:
+    label: str = 'Row'
+
+
+@dataclass
+class Page:
+    search: Annotated[Search, Lazy()]
+    make_row: Annotated[Callable[[], Row], Provider(Row)]
+    row_label: Annotated[str, Lazy(Row), Attr('label')]
+
+
+def make_injector() -> Injector:
+    registry = InjectorRegistry()
+    registry.register_factory(lambda container: Search(), Search)
+    registry.register_injectable(Row, Row, use_props=True)
+    container = registry.create_injectable_container()
+    return container.get(Injector)
+
+
+def test_lazy_not_made_until_used():
+    injector = make_injector()
+    made.clear()
+    page = injector(Page)
+    assert isinstance(page.search, LazyProxy)
+    assert made == []
+    assert page.search.query('this') == 'Found this'
+    assert page.search.query('that') == 'Found that'
+    assert made == ['Search']
+    assert page.row_label == 'Row'
+
+
+def test_provider_makes_each_call():
+    injector = make_injector()
+    page = injector(Page)
+    first, second = page.make_row(), page.make_row()
+    assert first == second == Row()
+    assert first is not second
+
+
+@dataclass
+class Left:
+    right: Annotated['Right', Lazy()]
+
+
+@dataclass
+class Right:
+    left: Left
+
+
+def test_lazy_breaks_cycle():
+    registry = InjectorRegistry()
+    registry.register_injectable(Left, Left)
+    registry.register_injectable(Right, Right)
+    assert registry.freeze(strict=True).ok
+    container = registry.create_injectable_container()
+    right = container.get(Right)
+    assert right.left.right.left is right.left
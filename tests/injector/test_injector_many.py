@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from wired_injector import InjectorRegistry
+from wired_injector.operators import Attr, Get
+
+from examples.factories import View
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+@dataclass
+class Row:
+    label: str
+    view: View
+    view_name: Annotated[str, Get(View), Attr('name')] = 'Default'
+    count: int = field(init=False, default=0)
+
+
+def test_inject_many(regular_injector):
+    rows = regular_injector.inject_many(
+        Row, [dict(label='one'), dict(label='two', view_name='Two')]
+    )
+    assert [row.label for row in rows] == ['one', 'two']
+    assert [row.view_name for row in rows] == ['View', 'Two']
+    assert rows[0].view is rows[1].view
+
+
+def test_inject_many_matches_single(regular_injector):
+    props_seq: List[Dict[str, Any]] = [
+        dict(label='one'),
+        dict(label='two', count=99),
+    ]
+    rows = regular_injector.inject_many(Row, props_seq)
+    assert rows == [regular_injector(Row, **props) for props in props_seq]
+
+
+def test_inject_many_system_props(regular_injector):
+    def target(label: str, site: str = 'Default'):
+        return label, site
+
+    props_seq = [dict(label='one'), dict(label='two', site='Two')]
+    rows = regular_injector.inject_many(target, props_seq, dict(site='Site'))
+    assert rows == [('one', 'Site'), ('two', 'Two')]
+
+
+def test_inject_many_resolves_shared_once():
+    @dataclass
+    class Heading:
+        name: str = 'Heading'
+
+    @dataclass
+    class Section:
+        label: str
+        heading: Heading
+
+    registry = InjectorRegistry()
+    registry.register_injectable(Heading, Heading, use_props=True)
+    registry.register_injectable(Section, Section, use_props=True)
+    container = registry.create_injectable_container()
+    props_seq = [dict(label=str(i)) for i in range(5)]
+    sections = container.inject_many(Section, props_seq)
+    assert [s.label for s in sections] == ['0', '1', '2', '3', '4']
+    assert len({id(s.heading) for s in sections}) == 1
+
+    # Compare with one at a time: each builds its own heading
+    one = container.inject(Section, label='one')
+    two = container.inject(Section, label='two')
+    assert one.heading is not two.heading
+
+
+def test_container_inject_many():
+    @dataclass
+    class Heading:
+        first_name: str = 'Default Name'
+
+    registry = InjectorRegistry()
+    registry.register_injectable(Heading, Heading, use_props=True)
+    container = registry.create_injectable_container()
+    headings = container.inject_many(
+        Heading, [dict(first_name='One'), dict()]
+    )
+    assert ['One', 'Default Name'] == [h.first_name for h in headings]
+
+
+def test_inject_iter(regular_injector):
+    pulled = []
+
+    def cursor():
+        for label in ('one', 'two', 'three'):
+            pulled.append(label)
+            yield dict(label=label)
+
+    rows = regular_injector.inject_iter(Row, cursor())
+    assert pulled == []
+    first = next(rows)
+    assert first.label == 'one'
+    assert pulled == ['one']
+    assert [row.label for row in rows] == ['two', 'three']
+
+
+def test_container_inject_iter():
+    @dataclass
+    class Heading:
+        first_name: str = 'Default Name'
+
+    registry = InjectorRegistry()
+    registry.register_injectable(Heading, Heading, use_props=True)
+    container = registry.create_injectable_container()
+    props_iterable = (dict(first_name=str(i)) for i in range(3))
+    headings = container.inject_iter(Heading, props_iterable)
+    assert ['0', '1', '2'] == [h.first_name for h in headings]
@@ -0,0 +1,159 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+from wired_injector import Injector, InjectorRegistry, injectable
+from wired_injector.markers import Slow
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+class Templates:
+    def __init__(self):
+        self.thread = threading.current_thread()
+
+
+class Config:
+    def __init__(self):
+        self.thread = threading.current_thread()
+
+
+def templates_factory(container):
+    time.sleep(0.05)
+    return Templates()
+
+
+def config_factory(container):
+    time.sleep(0.05)
+    return Config()
+
+
+@dataclass
+class Page:
+    templates: Annotated[Templates, Slow()]
+    config: Annotated[Config, Slow()]
+    title: str = 'Page'
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def make_injector(executor=None) -> Injector:
+    registry = InjectorRegistry(executor=executor)
+    registry.register_factory(templates_factory, Templates)
+    registry.register_factory(config_factory, Config)
+    container = registry.create_injectable_container()
+    return container.get(Injector)
+
+
+def test_slow_fields_in_parallel(executor):
+    # Each factory waits for the other to have started
+    barrier = threading.Barrier(2, timeout=5)
+
+    def templates(container):
+        barrier.wait()
+        return Templates()
+
+    def config(container):
+        barrier.wait()
+        return Config()
+
+    injector = make_injector(executor)
+    injector.container.register_factory(templates, Templates)
+    injector.container.register_factory(config, Config)
+    page = injector(Page, title='Mine')
+    assert page.title == 'Mine'
+    assert page.templates.thread is not threading.current_thread()
+    assert page.config.thread is not page.templates.thread
+
+
+class Shared:
+    pass
+
+
+@dataclass
+class Left:
+    shared: Shared
+
+
+@dataclass
+class Right:
+    shared: Shared
+
+
+def test_slow_fields_share_a_service(executor):
+    @dataclass
+    class Both:
+        left: Annotated[Left, Slow()]
+        right: Annotated[Right, Slow()]
+
+    made = []
+
+    def shared_factory(container):
+        made.append(threading.current_thread())
+        time.sleep(0.05)
+        return Shared()
+
+    registry = InjectorRegistry(executor=executor)
+    registry.register_factory(shared_factory, Shared)
+    registry.register_injectable(Left, Left)
+    registry.register_injectable(Right, Right)
+    container = registry.create_injectable_container()
+    both = container.get(Injector)(Both)
+    assert len(made) == 1
+    assert both.left.shared is both.right.shared
+    assert container.get(Shared) is both.left.shared
+
+
+def test_slow_ignored_without_executor():
+    injector = make_injector()
+    page = injector(Page)
+    assert page.templates.thread is threading.current_thread()
+
+
+@injectable(slow=True)
+@dataclass
+class Sidebar:
+    config: Config
+
+
+@dataclass
+class Layout:
+    sidebar: Sidebar
+    templates: Templates
+
+
+def test_injectable_slow(executor):
+    registry = InjectorRegistry(executor=executor)
+    registry.register_factory(templates_factory, Templates)
+    registry.register_factory(config_factory, Config)
+    registry.scan(__name__)
+    assert registry.slow_types == {Sidebar}
+
+    container = registry.create_injectable_container()
+    layout = container.get(Injector)(Layout)
+    assert layout.sidebar.config.thread is not threading.current_thread()
+    assert layout.templates.thread is threading.current_thread()
+
+
+def test_nested_slow_fields_no_deadlock():
+    @dataclass
+    class Outer:
+        page: Annotated[Page, Slow()]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        injector = make_injector(executor)
+        injector.container.register_factory(lambda c: Page, Page)
+        outer = injector(Outer)
+
+    worker = outer.page.templates.thread
+    assert worker is not threading.current_thread()
+    assert outer.page.config.thread is worker
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Any, List
+
+import pytest
+from wired import ServiceContainer
+from wired_injector import Injector
+from wired_injector.injector import _resolving
+from wired_injector.operators import Attr, Get
+from wired_injector.rules import NOT_FOUND
+
+from examples.factories import Settings
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+@dataclass
+class Footer:
+    site_name: Annotated[str, Get(Settings), Attr('site_name')]
+    flavor: str = 'Plain'
+
+
+@dataclass
+class Page:
+    site_name: Annotated[str, Get(Settings), Attr('site_name')]
+    language: Annotated[str, Get(Settings), Attr('language')]
+    footer: Annotated[Footer, Get(Footer)]
+
+
+@pytest.fixture
+def container(settings_registry) -> ServiceContainer:
+    settings_registry.register_injectable(Footer, Footer, use_props=True)
+    return settings_registry.create_injectable_container()
+
+
+def test_lookups_once_per_injection(monkeypatch, container):
+    looked_up: List[Any] = []
+    get = ServiceContainer.get
+
+    def counting_get(self, iface_or_type=None, **kwargs):
+        looked_up.append(iface_or_type)
+        return get(self, iface_or_type, **kwargs)
+
+    monkeypatch.setattr(ServiceContainer, 'get', counting_get)
+    page = container.get(Injector)(Page)
+    assert page.footer.site_name == 'My Site'
+    assert looked_up.count(Settings) == 1
+    assert looked_up.count(Injector) == 1
+
+    # A new injection asks again
+    container.get(Injector)(Page)
+    assert looked_up.count(Settings) == 2
+
+
+def test_scope_closed(container):
+    container.get(Injector)(Page)
+    scope = _resolving.scope
+    assert scope.cache is None
+    assert scope.services == {}
+
+
+def test_get_uses_active_injector(container):
+    def flavor(field_info, props, container, system_props):
+        if field_info.field_name == 'flavor':
+            return 'Custom'
+        return NOT_FOUND
+
+    injector = Injector(container, rules=(flavor,) + Injector.rules)
+    assert injector(Page).footer.flavor == 'Custom'
+    assert container.get(Injector)(Page).footer.flavor == 'Plain'
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+
+import pytest
+from wired import ServiceContainer
+from wired_injector import Injector, InjectorRegistry, injectable
+from wired_injector.async_injector import AsyncInjector
+from wired_injector.markers import Inject
+from wired_injector.operators import Attr, Get
+from wired_injector.rules import always_skip
+
+from examples.factories import Settings
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+class Title(str):
+    pass
+
+
+@dataclass
+class Heading:
+    settings: Annotated[Settings, Inject()]
+    site_name: Annotated[str, Get(Settings), Attr('site_name')]
+    container: ServiceContainer
+    title: Title = Title('Default')
+
+
+@injectable(strict=True)
+@dataclass
+class StrictHeading:
+    settings: Annotated[Settings, Inject()]
+    title: Title = Title('Default')
+
+
+@pytest.fixture
+def registry(settings_registry) -> InjectorRegistry:
+    settings_registry.register_singleton(Title('Registered'), Title)
+    settings_registry.scan(__name__)
+    return settings_registry
+
+
+def test_strict_injector(injector_mode, registry):
+    container = registry.create_injectable_container()
+    injector = Injector(container, strict=True, **injector_mode)
+    heading = injector(Heading)
+    assert isinstance(heading.settings, Settings)
+    assert heading.site_name == 'My Site'
+    assert heading.container is container
+    assert heading.title == 'Default'
+    assert injector(Heading, title='Prop').title == 'Prop'
+
+
+def test_not_strict(registry):
+    @dataclass
+    class Page:
+        title: Title
+
+    container = registry.create_injectable_container()
+    assert container.get(Injector)(Page).title == 'Registered'
+    with pytest.raises(TypeError):
+        Injector(container, strict=True)(Page)
+
+
+def test_strict_plan(registry):
+    container = registry.create_injectable_container()
+    injector = Injector(container, strict=True)
+    plan = injector.plans.get(Heading, injector.rules)
+    title = plan.field_plans[-1]
+    assert title.rules[-1] is always_skip
+
+
+def test_strict_injectable(registry):
+    container = registry.create_injectable_container()
+    heading = container.get(StrictHeading)
+    assert isinstance(heading.settings, Settings)
+    assert heading.title == 'Default'
+
+
+def test_strict_async(registry):
+    container = registry.create_injectable_container()
+    injector = Injector(container, strict=True)
+    async_injector = AsyncInjector.from_injector(injector)
+    assert async_injector.rules == injector.rules
+    assert async_injector(Heading).title == 'Default'
+
+
+def test_strict_freeze(registry):
+    @dataclass
+    class Required:
+        title: Title
+
+    registry.register_injectable(Required, Required, strict=True)
+    report = registry.freeze()
+    assert [str(f) for f in report.findings] == [
+        'test_strict_freeze.<locals>.Required.title: '
+        'not looked up in strict mode, mark it Inject()'
+    ]
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pytest
+from wired import ServiceContainer
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.async_injector import AsyncInjector
+from wired_injector.operators import Attr, Get, Operator
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+class Database:
+    name = 'Database'
+
+
+class Search:
+    name = 'Search'
+
+
+class Templates:
+    name = 'Templates'
+
+
+async def database_factory(container):
+    await asyncio.sleep(0.05)
+    return Database()
+
+
+async def search_factory(container):
+    await asyncio.sleep(0.05)
+    return Search()
+
+
+async def templates_factory(container):
+    await asyncio.sleep(0.05)
+    return Templates()
+
+
+@dataclass(frozen=True)
+class Upper(Operator):
+    """ An async operator """
+
+    async def __call__(self, previous, container):
+        await asyncio.sleep(0)
+        return previous.upper()
+
+
+@pytest.fixture
+def async_container():
+    registry = InjectorRegistry()
+    registry.register_factory(database_factory, Database)
+    registry.register_factory(search_factory, Search)
+    registry.register_factory(templates_factory, Templates)
+    return registry.create_injectable_container()
+
+
+@pytest.fixture
+def async_injector(async_container):
+    return AsyncInjector.from_injector(async_container.get(Injector))
+
+
+def test_ainject_awaits_factories(async_container, async_injector):
+    @dataclass
+    class Target:
+        container: ServiceContainer
+        database: Database
+        database_name: Annotated[str, Get(Database), Attr('name')]
+        title: str = 'Title'
+
+    target = asyncio.run(async_injector.ainject(Target, title='Mine'))
+    assert isinstance(target.database, Database)
+    assert target.database_name == 'Database'
+    assert target.container is async_container
+    assert target.title == 'Mine'
+
+
+def test_ainject_is_concurrent(async_injector):
+    @dataclass
+    class Target:
+        database: Database
+        search: Search
+        templates: Templates
+
+    start = time.perf_counter()
+    target = asyncio.run(async_injector.ainject(Target))
+    elapsed = time.perf_counter() - start
+    assert target.search.name == 'Search'
+    assert elapsed < 0.14
+
+
+def test_ainject_async_operator(async_injector):
+    @dataclass
+    class Target:
+        name: Annotated[str, Get(Search), Attr('name'), Upper()]
+
+    target = asyncio.run(async_injector.ainject(Target))
+    assert target.name == 'SEARCH'
+
+
+def test_ainject_missing_service(async_injector):
+    class Unregistered:
+        pass
+
+    @dataclass
+    class Target:
+        name: Annotated[str, Get(Unregistered), Attr('name')] = 'Default'
+
+    target = asyncio.run(async_injector.ainject(Target))
+    assert target.name == 'Default'
+
+
+def test_ainject_async_target(async_injector):
+    async def target(search: Search, suffix: str):
+        await asyncio.sleep(0)
+        return search.name + suffix
+
+    result = asyncio.run(async_injector.ainject(target, suffix='!'))
+    assert 'Search!' == result
+
+
+def test_ainject_nested_injectable(async_container, async_injector):
+    @dataclass
+    class Heading:
+        search: Search
+
+    @dataclass
+    class Section:
+        heading: Heading
+        database: Database
+        also_heading: Annotated[Heading, Get(Heading)]
+
+    async_container.register_factory(lambda c: Heading, Heading)
+    section = asyncio.run(async_injector.ainject(Section))
+    assert section.heading.search.name == 'Search'
+    assert section.also_heading.search is section.heading.search
+
+
+def test_container_ainject_props():
+    @dataclass
+    class Heading:
+        first_name: str = 'Default Name'
+
+    registry = InjectorRegistry()
+    registry.register_injectable(Heading, Heading, use_props=True)
+    container = registry.create_injectable_container()
+    heading = asyncio.run(container.ainject(Heading, first_name='Injected'))
+    assert 'Injected' == heading.first_name
+    assert container.get(AsyncInjector) is container.get(AsyncInjector)
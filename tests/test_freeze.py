@@ -0,0 +1,199 @@
+import sys
+from dataclasses import dataclass
+from types import ModuleType
+from typing import NamedTuple
+
+import pytest
+from wired import ServiceContainer
+from wired_injector import Injector, InjectorRegistry, injectable
+from wired_injector.freeze import FreezeError, PipelineWarning, find_cycles
+from wired_injector.operators import Attr, Call, Get
+
+from examples import factories
+from examples.factories import Customer, Greeting, Settings, View
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+class Missing:
+    name = 'Missing'
+
+
+class Owner(NamedTuple):
+    name: str
+
+
+@dataclass
+class SiteSettings:
+    owner: Owner
+    site_name: str = 'My Site'
+
+    @property
+    def title(self) -> str:
+        return self.site_name.title()
+
+
+def test_freeze_examples():
+    registry = InjectorRegistry()
+    registry.scan(factories)
+    report = registry.freeze(strict=True)
+    assert report.ok
+    assert Greeting in report.targets
+
+    # Containers use the plans made by freeze
+    container = registry.create_injectable_container(context=Customer())
+    injector = container.get(Injector)
+    assert injector.plans is registry.plans
+    assert registry.plans._compiled[Greeting]
+    assert container.get(Greeting)() == 'Hello VIEW'
+
+
+def test_freeze_findings(settings_registry):
+    @dataclass
+    class Heading:
+        container: ServiceContainer
+        injector: Injector
+        settings: Settings
+        view_name: Annotated[str, Get(View), Attr('name')]
+        missing: Missing
+        missing_name: Annotated[str, Get(Missing), Attr('name')]
+        optional: Missing = Missing()
+        title: str = 'Title'
+
+    registry = settings_registry
+    registry.register_factory(View.__wired_factory__, View)
+    registry.register_injectable(Heading, Heading)
+    report = registry.freeze()
+    assert not report.ok
+    assert [f.field_name for f in report.findings] == [
+        'missing',
+        'missing_name',
+    ]
+    assert str(report.findings[0]) == (
+        'test_freeze_findings.<locals>.Heading.missing: '
+        'no factory registered for Missing'
+    )
+    with pytest.raises(FreezeError) as exc:
+        registry.freeze(strict=True)
+    assert exc.value.report == report
+
+
+def test_freeze_use_props():
+    @dataclass
+    class Heading:
+        title: str
+        missing: Missing
+
+    registry = InjectorRegistry()
+    registry.register_injectable(Heading, Heading, use_props=True)
+    assert registry.freeze(strict=True).ok
+
+
+class LeftService:
+    pass
+
+
+class RightService:
+    pass
+
+
+@dataclass
+class Left:
+    right: RightService
+
+
+@dataclass
+class Right:
+    left: LeftService
+
+
+@dataclass
+class Top:
+    left: LeftService
+
+
+def test_freeze_cycle():
+    registry = InjectorRegistry()
+    registry.register_injectable(Top, Top)
+    registry.register_injectable(LeftService, Left)
+    registry.register_injectable(RightService, Right)
+    report = registry.freeze()
+    assert report.findings == ()
+    assert report.cycles == ((Left, Right, Left),)
+    assert str(report) == 'Cycle: Left -> Right -> Left'
+
+
+def test_find_cycles():
+    graph = dict(a=['b', 'c'], b=['c'], c=['a'], d=['d'])
+    assert find_cycles(graph) == [('a', 'b', 'c', 'a'), ('d', 'd')]
+
+
+def test_freeze_pipelines():
+    @dataclass
+    class Heading:
+        site_name: Annotated[str, Get(SiteSettings), Attr('site_name')]
+        title: Annotated[str, Get(SiteSettings), Attr('title')]
+        owner: Annotated[str, Get(SiteSettings), Attr('owner.name')]
+        upper: Annotated[
+            str, Get(SiteSettings), Attr('owner.name.upper'), Call('__call__')
+        ]
+        bad_owner: Annotated[str, Get(SiteSettings), Attr('owner.nmae')]
+        bad_attr: Annotated[str, Get(SiteSettings, attr='nmae')] = ''
+        bad_chain: Annotated[
+            str, Get(SiteSettings), Attr('owner'), Attr('nmae')
+        ] = ''
+
+    registry = InjectorRegistry()
+    registry.register_singleton(SiteSettings(Owner('Me')), SiteSettings)
+    registry.register_injectable(Heading, Heading)
+    report = registry.freeze()
+    assert [(f.field_name, f.message) for f in report.findings] == [
+        ('bad_owner', "Owner has no attribute 'nmae'"),
+        ('bad_attr', "SiteSettings has no attribute 'nmae'"),
+        ('bad_chain', "Owner has no attribute 'nmae'"),
+    ]
+
+
+def test_freeze_pipelines_class_attributes():
+    # Settings has no annotations, only class attributes
+    @dataclass
+    class Heading:
+        site_name: Annotated[str, Get(Settings), Attr('site_name')]
+        bad_name: Annotated[str, Get(Settings), Attr('site_nmae')]
+
+    registry = InjectorRegistry()
+    registry.register_singleton(Settings(), Settings)
+    registry.register_injectable(Heading, Heading)
+    report = registry.freeze()
+    assert not report.ok
+    assert [(f.field_name, f.message) for f in report.findings] == [
+        ('bad_name', "Settings has no attribute 'site_nmae'"),
+    ]
+
+
+FOOTER_SOURCE = """
+@injectable()
+@dataclass
+class Footer:
+    site_name: Annotated[str, Get(SiteSettings), Attr('site_nmae')]
+"""
+
+
+def test_scan_warns_pipelines(monkeypatch):
+    # Made here, as other tests scan the whole tests package
+    module = ModuleType('footer_module')
+    module.__dict__.update(
+        globals(), injectable=injectable, __name__=module.__name__
+    )
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    exec(FOOTER_SOURCE, module.__dict__)
+
+    registry = InjectorRegistry()
+    with pytest.warns(PipelineWarning) as warned:
+        registry.scan(module)
+    assert [str(w.message) for w in warned] == [
+        "Footer.site_name: SiteSettings has no attribute 'site_nmae'"
+    ]
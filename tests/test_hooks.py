@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.hooks import HookCollector, InjectionHook
+from wired_injector.operators import Attr, Get
+from wired_injector.rules import field_is_in_props, field_make_pipeline
+
+from examples.factories import Greeting, View
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+class Missing:
+    pass
+
+
+@dataclass
+class Heading:
+    title: str
+    view_name: Annotated[str, Get(View), Attr('name')]
+    missing: Annotated[str, Get(Missing)] = 'No Missing'
+
+
+def test_no_hook(regular_container):
+    injector = regular_container.get(Injector)
+    assert injector.hook is None
+    heading = injector(Heading, title='Hi')
+    assert heading.view_name == 'View'
+
+
+def test_hook_outcomes(regular_injector):
+    calls: List[Tuple[Any, ...]] = []
+
+    class Recorder(InjectionHook):
+        def on_target(self, target, elapsed):
+            calls.append(('target', target, elapsed >= 0))
+
+        def on_field(self, target, field_info, outcome):
+            calls.append(('field', field_info.field_name, outcome[1:]))
+
+        def on_operator(self, target, field_info, operator, elapsed):
+            calls.append(('operator', operator))
+
+    regular_injector.hook = Recorder()
+    heading = regular_injector(Heading, title='Hi')
+    assert heading.missing == 'No Missing'
+    assert calls == [
+        ('field', 'title', (field_is_in_props, False, False)),
+        ('operator', Get(View)),
+        ('operator', Attr('name')),
+        ('field', 'view_name', (field_make_pipeline, False, False)),
+        ('operator', Get(Missing)),
+        ('field', 'missing', (field_make_pipeline, True, True)),
+        ('target', Heading, True),
+    ]
+
+
+def test_hook_collector(regular_injector):
+    collector = HookCollector()
+    regular_injector.hook = collector
+    for i in range(3):
+        regular_injector(Heading, title=str(i))
+    regular_injector(Greeting)
+
+    assert collector.targets[Heading].count == 3
+    assert collector.targets[Greeting].count == 1
+    missing = collector.fields[(Heading, 'missing')]
+    assert (missing.count, missing.skipped, missing.lookup_errors) == (3, 3, 3)
+    assert collector.operators[repr(Get(Missing))].count == 3
+    assert collector.resolved_by[(Heading, 'title')] == {
+        'field_is_in_props': 3
+    }
+    assert [t for t, timing in collector.hottest_targets(1)] in (
+        [Heading],
+        [Greeting],
+    )
+
+    report = collector.report()
+    assert 'Heading.missing' in report
+    assert 'field_make_pipeline x3' in report
+
+    collector.clear()
+    assert collector.targets == {}
+
+
+def test_registry_hook():
+    collector = HookCollector()
+    registry = InjectorRegistry(hook=collector)
+    registry.register_injectable(View, View)
+    registry.register_injectable(Heading, Heading, use_props=True)
+    container = registry.create_injectable_container()
+    container.inject(Heading, title='Hi')
+    assert collector.targets[Heading].count == 1
+    assert collector.targets[View].count == 1
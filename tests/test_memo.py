@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import List
+
+import pytest
+from wired_injector import InjectorRegistry, injectable
+from wired_injector.memo import MemoCache, MemoInfo
+
+from examples.factories import Customer, FrenchCustomer, Settings
+
+made: List[str] = []
+
+
+@injectable(use_props=True, memoize=True)
+@dataclass(frozen=True)
+class Heading:
+    settings: Settings
+    title: str = 'Title'
+
+    def __post_init__(self):
+        made.append(self.title)
+
+
+@pytest.fixture
+def registry(settings_registry) -> InjectorRegistry:
+    settings_registry.scan(__name__)
+    return settings_registry
+
+
+def test_memoize(registry):
+    made.clear()
+    first = registry.create_injectable_container().inject(Heading, title='A')
+    second = registry.create_injectable_container().inject(Heading, title='A')
+    other = registry.create_injectable_container().inject(Heading, title='B')
+    assert first is second
+    assert other is not first
+    assert made == ['A', 'B']
+    assert registry.memo.cache_info() == MemoInfo(1, 2, 1024, 2)
+
+
+def test_memoize_context_class(registry):
+    containers = [
+        registry.create_injectable_container(context=context)
+        for context in (Customer(), Customer(), FrenchCustomer())
+    ]
+    one, two, french = [c.inject(Heading) for c in containers]
+    assert one is two
+    assert french is not one
+
+
+def test_memoize_unhashable_props(registry):
+    container = registry.create_injectable_container()
+    first = container.inject(Heading, title=['A'])
+    assert container.inject(Heading, title=['A']) is not first
+    assert registry.memo.cache_info().currsize == 0
+
+
+def test_memoize_invalidated(registry):
+    first = registry.create_injectable_container().inject(Heading)
+    registry.register_singleton(Settings(), Settings)
+    second = registry.create_injectable_container().inject(Heading)
+    assert first is not second
+    assert first.settings is not second.settings
+
+
+def test_memoize_bounded():
+    registry = InjectorRegistry(memo_size=2)
+    registry.register_singleton(Settings(), Settings)
+    registry.scan(__name__)
+    container = registry.create_injectable_container()
+    a = container.inject(Heading, title='A')
+    container.inject(Heading, title='B')
+    container.inject(Heading, title='A')
+    container.inject(Heading, title='C')  # Evicts B
+    assert registry.memo.cache_info().currsize == 2
+    made.clear()
+    assert container.inject(Heading, title='A') is a
+    container.inject(Heading, title='B')
+    assert made == ['B']
+
+
+def test_not_memoized(settings_registry):
+    registry = settings_registry
+    registry.register_injectable(Heading, Heading, use_props=True)
+    container = registry.create_injectable_container()
+    assert container.inject(Heading) is not container.inject(Heading)
+
+
+def test_memoize_registered_later(settings_registry):
+    # Containers made, or pooled, before the registration memoize too
+    registry = settings_registry
+    early = registry.create_injectable_container()
+    with registry.pool.container() as pooled:
+        pass
+    registry.register_injectable(
+        Heading, Heading, use_props=True, memoize=True
+    )
+    assert early.inject(Heading) is early.inject(Heading)
+    with registry.pool.container() as again:
+        assert again is pooled
+        assert again.inject(Heading) is early.inject(Heading)
+    assert registry.memo.cache_info().hits == 3
+
+
+def test_memo_cache():
+    memo = MemoCache(maxsize=1)
+    calls = []
+
+    def make(target, props, system_props):
+        calls.append(props)
+        return object()
+
+    first = memo.call(make, Heading, type(None), dict(a=1), dict(b=2))
+    assert memo.call(make, Heading, type(None), dict(a=1), dict(b=2)) is first
+    assert memo.call(make, Heading, type(None), dict(a=1), None) is not first
+    memo.clear()
+    assert memo.cache_info() == MemoInfo(1, 2, 1, 0)
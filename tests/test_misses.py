@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+
+import pytest
+from wired_injector import Injector, InjectorRegistry, injectable
+from zope.interface import Interface, alsoProvides
+
+from examples.factories import Customer, FrenchCustomer, Settings
+
+
+class Unregistered:
+    pass
+
+
+@injectable()
+@dataclass
+class Heading:
+    title: str = 'Title'
+    settings: Settings = Settings()
+
+
+@pytest.fixture
+def registry() -> InjectorRegistry:
+    # Settings isn't registered
+    registry = InjectorRegistry()
+    registry.scan(__name__)
+    return registry
+
+
+def test_field_default(registry):
+    # Defaults for built-in types aren't looked up at all
+    container = registry.create_injectable_container()
+    assert container.get(Heading).title == 'Title'
+    assert [key[0] for key in registry.misses._errors] == [Settings]
+
+
+def test_required_field(registry):
+    @dataclass
+    class Page:
+        settings: Settings
+
+    container = registry.create_injectable_container()
+    with pytest.raises(TypeError):
+        container.get(Injector)(Page)
+    assert [key[0] for key in registry.misses._errors] == [Settings]
+    with pytest.raises(TypeError):
+        container.get(Injector)(Page)
+
+
+def test_miss_raises_again(registry):
+    container = registry.create_injectable_container()
+    with pytest.raises(TypeError):
+        container.get(str)
+    with pytest.raises(LookupError):
+        container.get(Unregistered)
+    assert len(registry.misses) == 2
+    with pytest.raises(TypeError):
+        container.get(str)
+    with pytest.raises(LookupError):
+        container.get(Unregistered)
+    assert container.get(Unregistered, default=None) is None
+
+
+def test_register_factory_invalidates(registry):
+    container = registry.create_injectable_container()
+    with pytest.raises(LookupError):
+        container.get(Settings)
+    settings = Settings()
+    registry.register_singleton(settings, Settings)
+    assert len(registry.misses) == 0
+    assert container.get(Settings) is settings
+
+
+def test_register_injectable_invalidates(registry):
+    container = registry.create_injectable_container()
+    with pytest.raises(LookupError):
+        container.get(Unregistered)
+    registry.register_injectable(Unregistered, Unregistered)
+    container = registry.create_injectable_container()
+    assert isinstance(container.get(Unregistered), Unregistered)
+
+
+def test_per_context_class(registry):
+    registry.register_factory(
+        lambda container: Unregistered(), Unregistered, context=FrenchCustomer
+    )
+    container = registry.create_injectable_container(context=Customer())
+    with pytest.raises(LookupError):
+        container.get(Unregistered)
+    french = registry.create_injectable_container(context=FrenchCustomer())
+    assert isinstance(french.get(Unregistered), Unregistered)
+
+
+class IFrench(Interface):
+    pass
+
+
+class Ctx:
+    pass
+
+
+def test_per_context_provided(registry):
+    # wired matches on what the context provides, not its class
+    registry.register_factory(
+        lambda container: Unregistered(), Unregistered, context=IFrench
+    )
+    plain = registry.create_injectable_container(context=Ctx())
+    with pytest.raises(LookupError):
+        plain.get(Unregistered)
+    french_ctx = Ctx()
+    alsoProvides(french_ctx, IFrench)
+    french = registry.create_injectable_container(context=french_ctx)
+    assert isinstance(french.get(Unregistered), Unregistered)
+
+
+def test_local_services(registry):
+    container = registry.create_injectable_container()
+    with pytest.raises(LookupError):
+        container.get(Unregistered)
+    unregistered = Unregistered()
+    container.set(unregistered, Unregistered)
+    assert container.get(Unregistered) is unregistered
+
+    # Released containers drop their services, and use the misses again
+    registry.pool.release(container)
+    again = registry.pool.acquire()
+    assert again is container
+    with pytest.raises(LookupError):
+        again.get(Unregistered)
+
+
+def test_failing_factory_not_kept():
+    # The factory's own failed lookup doesn't make Heading a miss
+    registry = InjectorRegistry()
+
+    def heading_factory(container):
+        return Heading(settings=container.get(Settings))
+
+    registry.register_factory(heading_factory, Heading)
+    container = registry.create_injectable_container()
+    with pytest.raises(LookupError):
+        container.get(Heading)
+    assert [key[0] for key in registry.misses._errors] == [Settings]
@@ -1,6 +1,22 @@
 from dataclasses import dataclass
+from typing import Any, Dict, NamedTuple, Tuple
 
-from wired_injector.operators import Get, Attr, process_pipeline, Context
+import pytest
+from wired_injector.operators import (
+    AsDict,
+    Call,
+    Get,
+    Attr,
+    Key,
+    Operator,
+    _steps,
+    compile_pipeline,
+    process_pipeline,
+    Context,
+    Lazy,
+    Provider,
+)
+from wired_injector.rules import SkipField
 
 from examples.factories import (
     FrenchCustomer,
@@ -100,3 +116,147 @@ def test_context(regular_container):
         start=View,
     )
     assert result == regular_container.context
+
+
+def test_compile_pipeline(french_container):
+    run = compile_pipeline((Get(View), Attr('name'), Attr('upper')), View)
+    assert run(french_container)() == 'FRENCH VIEW'
+    assert compile_pipeline((), View)(french_container) is View
+
+
+def test_compile_pipeline_fuses_attrs():
+    steps = _steps((Context(), Attr('name'), Attr('upper'), Attr('name')))
+    assert len(steps) == 2
+
+
+def test_compiled_get_failed(french_container):
+    class Unregistered:
+        pass
+
+    run = compile_pipeline((Get(Unregistered),), View)
+    with pytest.raises(SkipField):
+        run(french_container)
+
+
+def test_pipeline_third_party_operators(french_container):
+    @dataclass(frozen=True)
+    class Upper(Operator):
+        def __call__(self, previous: Any, container: Any) -> Any:
+            return previous.upper()
+
+    def exclaim(previous, container):
+        return previous + '!'
+
+    pipeline: Tuple[Any, ...] = (Get(View), Attr('name'), Upper(), exclaim)
+    result = process_pipeline(french_container, pipeline, start=View)
+    assert result == 'FRENCH VIEW!'
+
+
+def test_pipeline_subclassed_operators(french_container):
+    # Subclasses overriding __call__ are called, not compiled as
+    # their parent
+    @dataclass(frozen=True)
+    class SafeAttr(Attr):
+        def __call__(self, previous: Any, container: Any) -> Any:
+            return getattr(previous, self.name, 'fallback')
+
+    @dataclass(frozen=True)
+    class GetOrNone(Get):
+        def __call__(self, previous: Any, container: Any) -> Any:
+            try:
+                return container.get(self.lookup_type)
+            except LookupError:
+                return None
+
+    class Unregistered:
+        pass
+
+    pipeline = (Get(View), SafeAttr('nmae'))
+    result = process_pipeline(french_container, pipeline, start=View)
+    assert result == 'fallback'
+    result = process_pipeline(
+        french_container, (GetOrNone(Unregistered),), start=View
+    )
+    assert result is None
+    assert len(_steps((Get(View), SafeAttr('name'), Attr('upper')))) == 3
+
+
+def test_attr_path(regular_container):
+    attr = Attr('name.upper')
+    result = attr(FrenchCustomer(), regular_container)
+    assert result() == 'FRENCH CUSTOMER'
+
+
+def test_key(regular_container):
+    assert Key('a')(dict(a=1), regular_container) == 1
+    assert Key(-1)([1, 2, 3], regular_container) == 3
+
+
+def test_call(regular_container):
+    call = Call('split', ' ', maxsplit=1)
+    result = call('French Customer Name', regular_container)
+    assert result == ['French', 'Customer Name']
+    assert hash(call) == hash(Call('split', ' ', maxsplit=1))
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+@dataclass
+class Box:
+    points: Tuple[Point, ...]
+    labels: Dict[str, str]
+
+
+def test_as_dict(regular_container):
+    box = Box((Point(1, 2),), dict(top='Top'))
+    result = AsDict()(box, regular_container)
+    assert result == dict(points=(Point(1, 2),), labels=dict(top='Top'))
+    assert result['labels'] is box.labels
+    assert AsDict()(Point(1, 2), regular_container) == dict(x=1, y=2)
+    with pytest.raises(TypeError):
+        AsDict()(object(), regular_container)
+
+
+def test_compile_pipeline_folds_getters(regular_container):
+    box = Box((Point(1, 2),), dict(top='Top'))
+    pipeline = (
+        Attr('labels'),
+        Key('top'),
+        Call('lower'),
+        Attr('upper'),
+        Call('__call__'),
+    )
+    assert len(_steps(pipeline)) == 1
+    run = compile_pipeline(pipeline, box)
+    assert run(regular_container) == 'TOP'
+
+    to_y = (Attr('points'), Key(0), AsDict(), Key('y'))
+    assert compile_pipeline(to_y, box)(regular_container) == 2
+
+
+def test_lazy(french_container):
+    lazy = Lazy()
+    result = lazy(View, french_container)
+    assert repr(result) == '<LazyProxy unresolved>'
+    assert result.name == 'French View'
+    assert repr(result) == "<LazyProxy FrenchView(name='French View')>"
+    assert result() == 'French View'
+
+
+def test_lazy_lookup_type(regular_container):
+    lazy = Lazy(Greeting)
+    result = lazy(str, regular_container)
+    assert result() == 'Hello VIEW'
+    result.customer_name = 'Changed'
+    assert result() == 'Hello Changed'
+
+
+def test_provider(regular_container):
+    provider = Provider()
+    provide = provider(Greeting, regular_container)
+    first = provide()
+    assert first() == 'Hello VIEW'
+    assert provide() is first  # The container caches the instance
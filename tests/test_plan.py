@@ -0,0 +1,199 @@
+import gc
+import threading
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
+
+from wired import ServiceContainer
+from wired_injector import InjectorRegistry
+from wired_injector.injector import Injector
+from wired_injector.plan import PlanCache, make_plan
+from wired_injector.rules import (
+    SKIP,
+    FieldIsInProps,
+    always_skip,
+    field_is_in_props,
+    field_make_pipeline,
+    use_container,
+    with_plan,
+)
+
+from examples.factories import View
+
+RULES = Injector.rules
+
+
+def test_make_plan_drops_builtin_rules():
+    @dataclass
+    class Target:
+        container: ServiceContainer
+        view: View
+        count: int = field(init=False, default=0)
+        names: Tuple[str, ...] = ()
+
+    plan = make_plan(Target, RULES)
+    container_plan, view_plan, count_plan, names_plan = plan.field_plans
+    assert container_plan.rules == (
+        field_is_in_props,
+        use_container,
+        field_make_pipeline,
+    )
+    assert view_plan.rules == (field_is_in_props, field_make_pipeline)
+    assert count_plan.rules == (
+        always_skip,
+        field_is_in_props,
+        always_skip,
+    )
+    assert names_plan.rules == (field_is_in_props, always_skip)
+
+
+def test_make_plan_custom_two_phase_rule(regular_injector):
+    def plan_uppercase(field_info, target):
+        if field_info.field_name.startswith('upper_'):
+            prop_name = field_info.field_name[6:]
+
+            def uppercase_prop(field_info, props, container, system_props):
+                if props and prop_name in props:
+                    return props[prop_name].upper()
+                return SKIP
+
+            return uppercase_prop
+        return None
+
+    @with_plan(plan_uppercase)
+    def uppercase(field_info, props, container, system_props):
+        raise NotImplementedError()  # pragma: no cover
+
+    def target(name: str = '', upper_name: str = 'Default'):
+        return upper_name
+
+    plan = make_plan(target, (uppercase,) + RULES)
+    name_plan, upper_name_plan = plan.field_plans
+    assert name_plan.rules == (field_is_in_props, always_skip)
+    assert upper_name_plan.rules[0].__name__ == 'uppercase_prop'
+
+    regular_injector.rules = (uppercase,) + RULES
+    assert 'HELLO' == regular_injector(target, name='hello')
+    assert 'Default' == regular_injector(target)
+
+
+def test_make_plan_adapts_legacy_rules():
+    @dataclass
+    class Target:
+        view: View
+
+    plan = make_plan(Target, (FieldIsInProps,))
+    assert plan.field_plans[0].rules == (field_is_in_props,)
+
+
+def test_plan_cache_reuses_plan():
+    @dataclass
+    class Target:
+        view: View
+
+    plans = PlanCache()
+    first = plans.get(Target, RULES)
+    assert first is plans.get(Target, RULES)
+    assert first is not plans.get(Target, (FieldIsInProps,))
+
+
+def test_plan_cache_is_weak():
+    plans = PlanCache()
+
+    @dataclass
+    class Target:
+        view: View
+
+    plans.get(Target, RULES)
+    assert len(plans._plans) == 1
+    del Target
+    gc.collect()
+    assert len(plans._plans) == 0
+
+
+def test_plan_cache_not_weakrefable(regular_container):
+    class Target:
+        __slots__ = ()
+
+        def __call__(self, view: View):
+            return view
+
+    plans = PlanCache()
+    plan = plans.get(Target(), RULES)
+    assert plan.field_plans[0].field_info.field_name == 'view'
+    assert len(plans._plans) == 0
+
+
+def test_plan_cache_bound_methods(regular_container):
+    class Handler:
+        def __init__(self, name: str):
+            self.name = name
+
+        def handle(self, view: View):
+            return self.name, view.name
+
+    plans = PlanCache()
+    injector = Injector(regular_container, plans=plans)
+    first, second = Handler('first'), Handler('second')
+    assert injector(first.handle) == ('first', 'View')
+    inject = plans.get_compiled(first.handle, injector.rules)
+    assert inject is not None
+    assert plans.get_compiled(second.handle, injector.rules) is inject
+    assert injector(second.handle) == ('second', 'View')
+    assert len(plans._compiled) == 1
+
+    # The function itself, taking self, has its own plan
+    plan = plans.get(Handler.handle, RULES)
+    assert len(plan.field_plans) == 2
+    assert len(plans.get(first.handle, RULES).field_plans) == 1
+
+
+def test_injector_uses_plans(regular_injector):
+    @dataclass
+    class Target:
+        view: View
+
+    first = regular_injector(Target)
+    plan = regular_injector.plans.get(Target, regular_injector.rules)
+    second = regular_injector(Target)
+    assert first.view.name == second.view.name == 'View'
+    assert plan is regular_injector.plans.get(Target, regular_injector.rules)
+
+
+def test_plan_cache_threads():
+    @dataclass
+    class Target:
+        view: View
+
+    plans = PlanCache()
+    barrier = threading.Barrier(8)
+    found: List[Any] = []
+
+    def plan():
+        barrier.wait()
+        found.append(plans.get(Target, RULES))
+        found.append(plans.get_compiled(Target, RULES))
+
+    threads = [threading.Thread(target=plan) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(f) for f in found[::2]}) == 1
+    assert len({id(f) for f in found[1::2]}) == 1
+
+
+def test_registry_plans_shared():
+    @dataclass
+    class Target:
+        view: View
+
+    registry = InjectorRegistry()
+    first, second = [
+        registry.create_injectable_container().get(Injector)
+        for i in range(2)
+    ]
+    assert first.plans is second.plans is registry.plans
+    first(Target, view=View())
+    assert second.plans.get(Target, second.rules) is registry.plans.get(
+        Target, RULES
+    )
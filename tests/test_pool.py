@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+
+import pytest
+from wired_injector import Injector, InjectorRegistry
+from wired_injector.async_injector import AsyncInjector
+from wired_injector.operators import Context
+
+from examples import factories
+from examples.factories import Customer, FrenchCustomer, Greeting, View
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated  # type: ignore
+
+
+@pytest.fixture
+def registry() -> InjectorRegistry:
+    registry = InjectorRegistry(pool_size=2)
+    registry.scan(factories)
+    return registry
+
+
+def test_acquire_release(registry):
+    pool = registry.pool
+    container = pool.acquire(context=Customer())
+    injector = container.get(Injector)
+    view = container.get(View)
+    assert container.get(Greeting)() == 'Hello VIEW'
+    pool.release(container)
+    assert len(pool) == 1
+
+    french = FrenchCustomer()
+    again = pool.acquire(context=french)
+    assert again is container
+    assert again.context is french
+    assert again.get(Injector) is injector
+    assert again.get(View).name == 'French View'
+    assert again.get(View) is not view
+    assert again.get(Greeting)() == 'Hello FRENCH VIEW'
+
+
+def test_release_drops_local_registrations(registry):
+    with registry.pool.container() as container:
+        container.register_singleton(View('Local'), View)
+        assert container.get(View).name == 'Local'
+        async_injector = container.get(AsyncInjector)
+    with registry.pool.container() as again:
+        assert again is container
+        assert again.get(View).name == 'View'
+        assert again.get(AsyncInjector) is not async_injector
+
+
+def test_pool_size(registry):
+    pool = registry.pool
+    containers = [pool.acquire() for i in range(3)]
+    assert len({id(c) for c in containers}) == 3
+    for container in containers:
+        pool.release(container)
+    assert len(pool) == 2
+
+
+def test_release_other_registry(registry):
+    container = InjectorRegistry().create_injectable_container()
+    with pytest.raises(ValueError):
+        registry.pool.release(container)
+
+
+def test_injector_keeps_context():
+    # View is for the None context so wired gets it from a container
+    # bound to None, which must still inject with the real context.
+    @dataclass
+    class Page:
+        customer: Annotated[Customer, Context()]
+
+    registry = InjectorRegistry()
+    registry.register_injectable(Page, Page)
+    customer = Customer()
+    container = registry.create_injectable_container(context=customer)
+    assert container.get(Page).customer is customer
+    assert container.get(Injector, context=None) is container.injector